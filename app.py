@@ -1,48 +1,209 @@
 import dash
-from dash import html, dcc, Input, Output, State, callback_context
+from dash import html, dcc, Input, Output, State, Patch, ClientsideFunction, callback_context
 import dash_bootstrap_components as dbc
-import pandas as pd
+from flask import Blueprint, Flask, request, jsonify, Response, stream_with_context
 from datetime import datetime
+import io
+import math
+import threading
+import time
 
 # Import application modules
-from config import DASH_TITLE, DEBUG
-from database.db import init_db, shutdown_db, db_session
+from config import (
+    DASH_TITLE, DEBUG, METRICS_ENABLED, PUSH_CHECK_INTERVAL, PUSH_MAX_STREAMS, PUSH_STREAM_TIMEOUT,
+    SLOW_QUERY_MS
+)
+from database.db import (
+    ensure_db, shutdown_db, db_session, begin_query_scope, end_query_scope, data_revision,
+    wait_for_change, slow_query_log
+)
 from controllers.todo_controller import TaskController, CategoryController
-from views import create_layout
-from views.components import task_form, task_list
-
-# Initialize the Dash app
-app = dash.Dash(
-    __name__,
-    external_stylesheets=[
-        dbc.themes.BOOTSTRAP,
-        'https://use.fontawesome.com/releases/v5.15.4/css/all.css'
-    ],
-    title=DASH_TITLE,
-    suppress_callback_exceptions=True
+from controllers.transfer_controller import TransferController, TaskImportError, FORMATS
+from monitoring import instrument_app
+from views import create_layout, category_items
+from views.components import (
+    task_form, bulk_action_options, first_window, search_window, next_window_page,
+    previous_window_page, patch_window_task, window_size, CLIENT_RENDERING, TASK_LIST_OUTPUT
 )
 
-# Initialize the database
-init_db()
+# Callbacks registered by create_app(), as (args, kwargs, function) and
+# (args, kwargs) tuples. The callback functions stay callable directly.
+CALLBACKS = []
+CLIENTSIDE_CALLBACKS = []
+
+# Routes of the Flask server next to the Dash app
+routes = Blueprint("routes", __name__)
+
+# Milliseconds the overdue timer and the event stream wait past a due date,
+# so the task is overdue when they wake up
+OVERDUE_TIMER_MARGIN = 10
+
+# Longest overdue timer interval, browsers run longer intervals right away
+OVERDUE_TIMER_MAX = 24 * 60 * 60 * 1000
+
+# Event streams open in this process, each one holds a server thread
+_stream_slots = threading.BoundedSemaphore(PUSH_MAX_STREAMS)
+
+
+def callback(*args, **kwargs):
+    """Declare a callback like app.callback, for every app made by create_app()."""
+    def register(func):
+        CALLBACKS.append((args, kwargs, func))
+        return func
+    return register
+
+
+def clientside_callback(*args, **kwargs):
+    """Declare a clientside callback like app.clientside_callback."""
+    CLIENTSIDE_CALLBACKS.append((args, kwargs))
+
+
+def task_filters(filter_completed):
+    """Return the task list filters selected by the filter controls."""
+    return {"completed": False if filter_completed else None}
+
+
+def view_revision(data=None):
+    """
+    Return a token that changes whenever the data changes or a task becomes overdue.
+    
+    Args:
+        data: Token of data_revision() to use, read now when None
+    """
+    data = data or data_revision()
+    # The next due date of the timeline moves on as soon as a task passes it
+    next_overdue = TaskController.get_next_overdue_time()
+    return f"{data}/{next_overdue.isoformat() if next_overdue else ''}"
+
+
+def first_task_page(filter_completed, search=None):
+    """Render the first task page, or the search results, with its window and revision."""
+    # Read the revision first, a write landing during the render is picked up next tick
+    app_state = Patch()
+    app_state["tasks"] = view_revision()
+    
+    if search and search.strip():
+        list_items, window = search_window(search, **task_filters(filter_completed))
+    else:
+        list_items, window = first_window(**task_filters(filter_completed))
+    return list_items, window, app_state
+
+
+def can_patch_task_list(app_state, window):
+    """Check whether the rendered task list is current enough to be patched."""
+    return bool(window_size(window) and app_state
+                and app_state.get("tasks") == view_revision())
+
+
+def patch_task_item(task_id, old_position, app_state, window, filter_completed):
+    """
+    Move one task of the rendered task list with a Patch.
+    
+    Args:
+        task_id: ID of the task that changed
+        old_position: Index of the task before the change, None if it was not listed
+        app_state: Current app-state data
+        window: Current task-list-window data
+        filter_completed: Whether completed tasks are hidden
+    
+    Returns:
+        The task list callback outputs
+    """
+    revision = view_revision()
+    patched = patch_window_task(window, task_id, old_position, **task_filters(filter_completed))
+    if patched is None:
+        # Let the full render show the placeholder or the next page
+        return first_task_page(filter_completed)
+    
+    list_items, window = patched
+    app_state = Patch()
+    app_state["tasks"] = revision
+    return list_items, window, app_state
 
-# Set the app layout
-app.layout = create_layout()
 
 # Define callbacks
-@app.callback(
-    Output("task-list", "children"),
+@callback(
+    Output(*TASK_LIST_OUTPUT),
+    Output("task-list-window", "data"),
+    Output("app-state", "data"),
     [
-        Input("refresh-interval", "n_intervals"),
-        Input("filter-completed", "value")
-    ]
+        Input("refresh-signal", "data"),
+        Input("filter-completed", "value"),
+        Input("task-search", "value")
+    ],
+    [State("app-state", "data")]
 )
-def update_task_list(n_intervals, filter_completed):
+def update_task_list(refresh, filter_completed, search, app_state):
     """Update the task list."""
-    tasks = TaskController.get_all_tasks()
-    return task_list(tasks=tasks, filter_completed=filter_completed).children[2]
+    # Skip refreshes when nothing changed since the list was rendered
+    if (callback_context.triggered_id == "refresh-signal"
+            and (app_state or {}).get("tasks") == view_revision()):
+        return dash.no_update, dash.no_update, dash.no_update
+    
+    return first_task_page(filter_completed, search)
 
 
-@app.callback(
+@callback(
+    Output(*TASK_LIST_OUTPUT, allow_duplicate=True),
+    Output("task-list-window", "data", allow_duplicate=True),
+    [
+        Input("load-more-tasks", "n_clicks"),
+        Input("load-previous-tasks", "n_clicks")
+    ],
+    [
+        State("task-list-window", "data"),
+        State("filter-completed", "value")
+    ],
+    prevent_initial_call=True
+)
+def scroll_task_list(more_clicks, previous_clicks, window, filter_completed):
+    """Load the page after or before the rendered window of the task list."""
+    if not window_size(window):
+        return dash.no_update, dash.no_update
+    
+    # Only the new page is sent, pages leaving the window are dropped by the browser
+    if callback_context.triggered_id == "load-previous-tasks":
+        if not window["offset"]:
+            return dash.no_update, dash.no_update
+        return previous_window_page(window, **task_filters(filter_completed))
+    
+    if not window["has_next"]:
+        return dash.no_update, dash.no_update
+    return next_window_page(window, **task_filters(filter_completed))
+
+
+# Show the window buttons while there are tasks beyond either end of the window
+clientside_callback(
+    ClientsideFunction(namespace="task_list", function_name="window_buttons"),
+    Output("load-previous-tasks", "style"),
+    Output("load-more-tasks", "style"),
+    Input("task-list-window", "data")
+)
+
+
+# Render the task list in the browser from the compact task rows
+if CLIENT_RENDERING:
+    clientside_callback(
+        ClientsideFunction(namespace="task_rows", function_name="render"),
+        Output("task-list", "children"),
+        Input("task-list-data", "data"),
+        State("task-list", "children")
+    )
+
+
+# Refresh on pushed changes, and on polling and overdue timer ticks while the
+# event stream is down
+clientside_callback(
+    ClientsideFunction(namespace="push", function_name="refresh"),
+    Output("refresh-signal", "data"),
+    Input("push-refresh", "n_clicks"),
+    Input("refresh-interval", "n_intervals"),
+    Input("overdue-timer", "n_intervals"),
+    prevent_initial_call=True
+)
+
+
+@callback(
     Output("task-form-container", "children"),
     Output("task-form-container", "style"),
     [Input("add-task-button", "n_clicks")],
@@ -59,20 +220,43 @@ def toggle_task_form(n_clicks, style):
     return task_form(), {"display": "block"}
 
 
-@app.callback(
+# Clicks on the items of the task list are turned into small events in the
+# browser, so a click only uploads the ID and value of the clicked item rather
+# than the values of every item matched by an ALL wildcard
+clientside_callback(
+    ClientsideFunction(namespace="task_events", function_name="item_event"),
+    Output("task-toggle-event", "data"),
+    Output("task-edit-event", "data"),
+    Output("task-delete-event", "data"),
+    Input({"type": "task-checkbox", "index": dash.ALL}, "value"),
+    Input({"type": "edit-task", "index": dash.ALL}, "n_clicks"),
+    Input({"type": "delete-task", "index": dash.ALL}, "n_clicks"),
+    prevent_initial_call=True
+)
+
+
+# Collect the IDs of the selected tasks when a bulk action is applied
+clientside_callback(
+    ClientsideFunction(namespace="task_events", function_name="bulk_event"),
+    Output("bulk-action-event", "data"),
+    Input("apply-bulk-action", "n_clicks"),
+    State("select-all-tasks", "value"),
+    State({"type": "task-select", "index": dash.ALL}, "value"),
+    State({"type": "task-select", "index": dash.ALL}, "id"),
+    prevent_initial_call=True
+)
+
+
+@callback(
     Output("task-form-container", "children", allow_duplicate=True),
-    [Input({"type": "edit-task", "index": dash.ALL}, "n_clicks")],
+    [Input("task-edit-event", "data")],
     prevent_initial_call=True
 )
-def edit_task(edit_clicks):
+def edit_task(event):
     """Show the task form for editing a task."""
-    ctx = callback_context
-    if not ctx.triggered:
+    if not event:
         return dash.no_update
-    
-    # Get the task ID from the triggered component
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-    task_id = int(eval(button_id)["index"])
+    task_id = int(event["index"])
     
     # Get the task
     task = TaskController.get_task_by_id(task_id)
@@ -83,25 +267,37 @@ def edit_task(edit_clicks):
     return task_form(task=task)
 
 
-@app.callback(
-    Output("task-list", "children", allow_duplicate=True),
+@callback(
+    Output(*TASK_LIST_OUTPUT, allow_duplicate=True),
+    Output("task-list-window", "data", allow_duplicate=True),
+    Output("app-state", "data", allow_duplicate=True),
     [Input("submit-task", "n_clicks")],
     [
+        State("filter-completed", "value"),
+        State("task-list-window", "data"),
+        State("app-state", "data"),
         State("task-id", "data"),
         State("title-input", "value"),
         State("description-input", "value"),
         State("due-date-input", "date"),
         State("priority-input", "value"),
-        State("category-input", "value")
+        State("category-input", "value"),
+        State("task-search", "value")
     ],
     prevent_initial_call=True
 )
-def submit_task(n_clicks, task_id, title, description, due_date, priority, category_id):
+def submit_task(n_clicks, filter_completed, window, app_state, task_id, title, description,
+                due_date, priority, category_id, search):
     """Submit a task (create or update)."""
     if not n_clicks or not title:
-        return dash.no_update
+        return dash.no_update, dash.no_update, dash.no_update
     
+    patchable = can_patch_task_list(app_state, window)
+    old_position = None
     if task_id:
+        if patchable:
+            old_position = TaskController.get_task_position(task_id, **task_filters(filter_completed))
+        
         # Update existing task
         TaskController.update_task(
             task_id,
@@ -113,68 +309,140 @@ def submit_task(n_clicks, task_id, title, description, due_date, priority, categ
         )
     else:
         # Create new task
-        TaskController.create_task(
+        task_id = TaskController.create_task(
             title=title,
             description=description,
             due_date=due_date,
             priority=priority,
             category_id=category_id
-        )
+        ).id
     
-    # Return updated task list
-    tasks = TaskController.get_all_tasks()
-    return task_list(tasks=tasks).children[2]
+    # Only send the changed item when the browser's list is up to date
+    if patchable:
+        return patch_task_item(task_id, old_position, app_state, window, filter_completed)
+    return first_task_page(filter_completed, search)
 
 
-@app.callback(
-    Output("task-list", "children", allow_duplicate=True),
-    [Input({"type": "task-checkbox", "index": dash.ALL}, "value")],
-    [State({"type": "task-checkbox", "index": dash.ALL}, "id")],
+@callback(
+    Output(*TASK_LIST_OUTPUT, allow_duplicate=True),
+    Output("task-list-window", "data", allow_duplicate=True),
+    Output("app-state", "data", allow_duplicate=True),
+    [Input("task-toggle-event", "data")],
+    [
+        State("filter-completed", "value"),
+        State("task-list-window", "data"),
+        State("app-state", "data"),
+        State("task-search", "value")
+    ],
     prevent_initial_call=True
 )
-def toggle_task_completion(checked_values, checkbox_ids):
-    """Toggle task completion status."""
-    ctx = callback_context
-    if not ctx.triggered:
-        return dash.no_update
-    
-    # Get the task ID from the triggered component
-    checkbox_id = ctx.triggered[0]["prop_id"].split(".")[0]
-    task_id = int(eval(checkbox_id)["index"])
+def toggle_task_completion(event, filter_completed, window, app_state, search):
+    """Set the completion status of a task to the value of its checkbox."""
+    if not event:
+        return dash.no_update, dash.no_update, dash.no_update
+    task_id = int(event["index"])
+    completed = bool(event["value"])
     
-    # Toggle task completion
-    TaskController.toggle_task_completion(task_id)
+    if not can_patch_task_list(app_state, window):
+        TaskController.update_task(task_id, completed=completed)
+        return first_task_page(filter_completed, search)
     
-    # Return updated task list
-    tasks = TaskController.get_all_tasks()
-    return task_list(tasks=tasks).children[2]
+    # Update the task and move it to its new position
+    old_position = TaskController.get_task_position(task_id, **task_filters(filter_completed))
+    TaskController.update_task(task_id, completed=completed)
+    return patch_task_item(task_id, old_position, app_state, window, filter_completed)
 
 
-@app.callback(
-    Output("task-list", "children", allow_duplicate=True),
-    [Input({"type": "delete-task", "index": dash.ALL}, "n_clicks")],
+@callback(
+    Output(*TASK_LIST_OUTPUT, allow_duplicate=True),
+    Output("task-list-window", "data", allow_duplicate=True),
+    Output("app-state", "data", allow_duplicate=True),
+    [Input("task-delete-event", "data")],
+    [
+        State("filter-completed", "value"),
+        State("task-list-window", "data"),
+        State("app-state", "data"),
+        State("task-search", "value")
+    ],
     prevent_initial_call=True
 )
-def delete_task(delete_clicks):
+def delete_task(event, filter_completed, window, app_state, search):
     """Delete a task."""
-    ctx = callback_context
-    if not ctx.triggered:
-        return dash.no_update
+    if not event:
+        return dash.no_update, dash.no_update, dash.no_update
+    task_id = int(event["index"])
     
-    # Get the task ID from the triggered component
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-    task_id = int(eval(button_id)["index"])
+    if not can_patch_task_list(app_state, window):
+        TaskController.delete_task(task_id)
+        return first_task_page(filter_completed, search)
     
-    # Delete the task
+    # Delete the task and remove its list item
+    old_position = TaskController.get_task_position(task_id, **task_filters(filter_completed))
     TaskController.delete_task(task_id)
+    return patch_task_item(task_id, old_position, app_state, window, filter_completed)
+
+
+def parse_bulk_action(action):
+    """
+    Translate a bulk action dropdown value into a TaskController call.
+    
+    Args:
+        action: Value of the bulk-action dropdown
     
-    # Return updated task list
-    tasks = TaskController.get_all_tasks()
-    return task_list(tasks=tasks).children[2]
+    Returns:
+        The bulk method to call and its positional arguments
+    """
+    if action == "delete":
+        return TaskController.bulk_delete_tasks, ()
+    if action in ("complete", "reopen"):
+        return TaskController.bulk_update_tasks, ({"completed": action == "complete"},)
+    
+    column, _, value = action.partition(":")
+    if column == "priority":
+        return TaskController.bulk_update_tasks, ({"priority": int(value)},)
+    return TaskController.bulk_update_tasks, ({"category_id": int(value) if value else None},)
 
 
-@app.callback(
+@callback(
+    Output(*TASK_LIST_OUTPUT, allow_duplicate=True),
+    Output("task-list-window", "data", allow_duplicate=True),
+    Output("app-state", "data", allow_duplicate=True),
+    Output("select-all-tasks", "value"),
+    [Input("bulk-action-event", "data")],
+    [
+        State("bulk-action", "value"),
+        State("select-all-tasks", "value"),
+        State("filter-completed", "value"),
+        State("task-search", "value")
+    ],
+    prevent_initial_call=True
+)
+def apply_bulk_action(event, action, select_all, filter_completed, search):
+    """Apply a bulk action to the selected tasks with one statement."""
+    if not event or not action:
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    
+    if select_all and search and search.strip():
+        # Every listed search result
+        task_ids = event["listed"]
+    elif select_all:
+        # Every task matching the list filters, rendered or not
+        task_ids = None
+    else:
+        task_ids = event["selected"]
+    if task_ids is not None and not task_ids:
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    
+    method, args = parse_bulk_action(action)
+    method(*args, task_ids=task_ids, **task_filters(filter_completed))
+    
+    # Rendering the first page again also clears the selection
+    return (*first_task_page(filter_completed, search), False)
+
+
+@callback(
     Output("category-list", "children"),
+    Output("bulk-action", "options"),
     [
         Input("add-category-button", "n_clicks"),
         Input({"type": "delete-category", "index": dash.ALL}, "n_clicks")
@@ -189,83 +457,75 @@ def manage_categories(add_clicks, delete_clicks, category_name, category_color):
     """Add or delete categories."""
     ctx = callback_context
     if not ctx.triggered:
-        return dash.no_update
+        return dash.no_update, dash.no_update
     
-    triggered_id = ctx.triggered[0]["prop_id"].split(".")[0]
+    triggered_id = ctx.triggered_id
     
     if triggered_id == "add-category-button" and category_name:
         # Add new category
         CategoryController.create_category(name=category_name, color=category_color)
-    else:
-        # Check if it's a delete button
-        try:
-            button_id = eval(triggered_id)
-            if button_id.get("type") == "delete-category":
-                category_id = button_id.get("index")
-                CategoryController.delete_category(category_id)
-        except:
-            pass
-    
-    # Get updated categories
-    categories = CategoryController.get_all_categories()
+    elif isinstance(triggered_id, dict) and triggered_id.get("type") == "delete-category":
+        # Delete button of a category
+        CategoryController.delete_category(triggered_id["index"])
     
     # Return updated category list
-    if not categories:
-        return [
-            dbc.ListGroupItem(
-                "No categories yet. Add one above!",
-                className="text-center font-italic"
-            )
-        ]
+    categories = CategoryController.get_all_categories()
+    return category_items(categories), bulk_action_options(categories)
+
+
+def overdue_timer(interval):
+    """
+    Return the overdue-timer settings that fire right after the next task becomes overdue.
     
-    return [
-        dbc.ListGroupItem(
-            [
-                html.Span(
-                    cat.name,
-                    style={
-                        "backgroundColor": cat.color,
-                        "color": "white",
-                        "padding": "0.25rem 0.5rem",
-                        "borderRadius": "0.25rem"
-                    }
-                ),
-                html.Button(
-                    html.I(className="fas fa-trash"),
-                    id={"type": "delete-category", "index": cat.id},
-                    className="btn btn-sm btn-outline-danger float-end",
-                    title="Delete Category"
-                )
-            ],
-            id={"type": "category-item", "index": cat.id},
-            action=True
-        )
-        for cat in categories
-    ]
+    Args:
+        interval: Current interval of the timer in milliseconds
+    
+    Returns:
+        An (interval, disabled) tuple
+    """
+    next_overdue = TaskController.get_next_overdue_time()
+    if next_overdue is None:
+        return dash.no_update, True
+    
+    seconds = (next_overdue - datetime.now()).total_seconds()
+    # Browsers fire longer intervals right away, a timer firing early finds
+    # nothing changed and simply repeats
+    delay = min(max(math.ceil(seconds * 1000), 0) + OVERDUE_TIMER_MARGIN, OVERDUE_TIMER_MAX)
+    if delay == interval:
+        # The timer only restarts when its interval changes
+        delay += 1
+    return delay, False
 
 
-@app.callback(
+@callback(
     Output("task-statistics", "children"),
-    [Input("refresh-interval", "n_intervals")]
+    Output("app-state", "data", allow_duplicate=True),
+    Output("overdue-timer", "interval"),
+    Output("overdue-timer", "disabled"),
+    [Input("refresh-signal", "data")],
+    [State("app-state", "data"), State("overdue-timer", "interval")],
+    prevent_initial_call="initial_duplicate"
 )
-def update_statistics(n_intervals):
-    """Update task statistics."""
-    tasks = TaskController.get_all_tasks()
+def update_statistics(refresh, app_state, timer_interval):
+    """Update task statistics, and time the next refresh to the next overdue task."""
+    # Skip refreshes when nothing changed since the statistics were rendered
+    revision = view_revision()
+    if (app_state or {}).get("statistics") == revision:
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    
+    statistics = TaskController.get_task_statistics()
     
-    total_tasks = len(tasks)
-    completed_tasks = sum(1 for task in tasks if task.completed)
-    pending_tasks = total_tasks - completed_tasks
+    total_tasks = statistics["total"]
+    completed_tasks = statistics["completed"]
+    pending_tasks = statistics["pending"]
+    overdue_tasks = statistics["overdue"]
+    priority_counts = statistics["priorities"]
     
     # Calculate completion rate
     completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
     
-    # Count tasks by priority
-    priority_counts = {1: 0, 2: 0, 3: 0}
-    for task in tasks:
-        priority_counts[task.priority] = priority_counts.get(task.priority, 0) + 1
-    
-    # Count overdue tasks
-    overdue_tasks = sum(1 for task in tasks if task.is_overdue)
+    app_state = Patch()
+    app_state["statistics"] = revision
     
     return [
         dbc.Row([
@@ -318,15 +578,159 @@ def update_statistics(n_intervals):
                 html.Span(f"Low: {priority_counts[1]}", className="badge bg-info")
             ])
         ])
-    ]
+    ], app_state, *overdue_timer(timer_interval)
+
+
+@routes.route("/tasks/export")
+def export_tasks():
+    """Stream every task as CSV or JSON Lines (?format=jsonl)."""
+    file_format = request.args.get("format", "csv")
+    if file_format not in FORMATS:
+        return jsonify(error=f"Unsupported format: {file_format}"), 400
+    
+    return Response(
+        stream_with_context(TransferController.export_tasks(file_format)),
+        mimetype=FORMATS[file_format],
+        headers={"Content-Disposition": f"attachment; filename=tasks.{file_format}"}
+    )
+
+
+@routes.route("/tasks/import", methods=["POST"])
+def import_tasks():
+    """Import tasks from an uploaded file or from the request body."""
+    file_format = request.args.get("format", "csv")
+    if file_format not in FORMATS:
+        return jsonify(error=f"Unsupported format: {file_format}"), 400
+    
+    upload = request.files.get("file")
+    stream = io.TextIOWrapper(upload.stream if upload else request.stream,
+                              encoding="utf-8", newline="")
+    try:
+        imported = TransferController.import_tasks(stream, file_format)
+    except TaskImportError as error:
+        # Batches before the invalid input are committed, tell how many
+        return jsonify(error=str(error), imported=error.imported), 400
+    return jsonify(imported=imported)
+
+
+@routes.route("/events")
+def data_events():
+    """Stream a Server-Sent Event named change whenever the data changes or a task becomes overdue."""
+    # Keep threads for the callbacks, browsers turned away poll instead
+    if not _stream_slots.acquire(blocking=False):
+        return Response("Too many event streams", status=503, headers={"Retry-After": "60"})
+    
+    def events():
+        # Browsers reopen the stream a second after it closes
+        yield "retry: 1000\n\n"
+        data = data_revision()
+        revision = view_revision(data)
+        deadline = time.monotonic() + PUSH_STREAM_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            timeout = min(remaining, 15)
+            next_overdue = TaskController.get_next_overdue_time()
+            if next_overdue is not None:
+                # Wake up right after the next task becomes overdue
+                seconds = (next_overdue - datetime.now()).total_seconds()
+                timeout = min(timeout, max(seconds, 0) + OVERDUE_TIMER_MARGIN / 1000)
+            # Give back the connection the timeline was read through while waiting
+            shutdown_db()
+            
+            data = wait_for_change(data, timeout, PUSH_CHECK_INTERVAL)
+            current = view_revision(data)
+            if current == revision:
+                # Comments keep proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            
+            revision = current
+            yield f"event: change\ndata: {revision}\n\n"
+            # Send a burst of commits, such as an import, as one event
+            time.sleep(0.25)
+    
+    response = Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    # Also called when the client leaves before the stream started
+    response.call_on_close(_stream_slots.release)
+    return response
+
+
+# Count the queries of each callback to catch N+1 patterns, and list the slow
+# queries, during development
+if DEBUG:
+    @routes.before_app_request
+    def begin_callback_queries():
+        if request.path.endswith("/_dash-update-component"):
+            payload = request.get_json(silent=True) or {}
+            begin_query_scope(payload.get("output", request.path))
+    
+    @routes.teardown_app_request
+    def end_callback_queries(exception=None):
+        end_query_scope()
+    
+    @routes.route("/debug/slow-queries")
+    def slow_queries():
+        """List the recent slow queries of this process with their query plans."""
+        return jsonify(
+            threshold_ms=SLOW_QUERY_MS,
+            queries=slow_query_log.entries() if slow_query_log else []
+        )
 
 
 # Shutdown database connection when app is closed
-@app.server.teardown_appcontext
+@routes.teardown_app_request
 def shutdown_session(exception=None):
     shutdown_db()
 
 
+def create_app():
+    """
+    Create the Dash app with its callbacks and routes.
+    
+    Creating the app touches neither the database nor the task data: the
+    schema is checked before the first request, and the layout is rendered
+    on each page load.
+    
+    Returns:
+        A Dash app
+    """
+    server = Flask(__name__)
+    # Runs before the first-request setup of Dash, which renders the layout once
+    server.before_request(ensure_db)
+    
+    app = dash.Dash(
+        __name__,
+        server=server,
+        external_stylesheets=[
+            dbc.themes.BOOTSTRAP,
+            'https://use.fontawesome.com/releases/v5.15.4/css/all.css'
+        ],
+        title=DASH_TITLE,
+        suppress_callback_exceptions=True
+    )
+    
+    # Record callback and database metrics, served on /metrics
+    if METRICS_ENABLED:
+        instrument_app(app)
+    
+    app.layout = create_layout
+    for args, kwargs, func in CALLBACKS:
+        app.callback(*args, **kwargs)(func)
+    for args, kwargs in CLIENTSIDE_CALLBACKS:
+        app.clientside_callback(*args, **kwargs)
+    server.register_blueprint(routes)
+    return app
+
+
+app = create_app()
+
+
 # Run the app
 if __name__ == "__main__":
     app.run_server(debug=DEBUG)
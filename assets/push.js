@@ -0,0 +1,61 @@
+/* Push updates: refresh the data when the server reports a change */
+
+(function () {
+    // Milliseconds before trying again after the server refused the stream
+    var REFUSED_RETRY = 60000;
+    var connected = false;
+    var source = null;
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        push: {
+            // Let polling and overdue timer ticks through only while the
+            // event stream is down, the stream reports both kinds of change
+            refresh: function (pushClicks, intervals, overdueTicks) {
+                var triggered = window.dash_clientside.callback_context.triggered;
+                var polled = triggered.some(function (trigger) {
+                    return trigger.prop_id === "refresh-interval.n_intervals"
+                        || trigger.prop_id === "overdue-timer.n_intervals";
+                });
+                if (polled && connected) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                return Date.now();
+            }
+        }
+    });
+
+    function connect() {
+        var button = document.getElementById("push-refresh");
+        if (source || !button || !button.dataset.url || !window.EventSource) {
+            return;
+        }
+
+        var opened = false;
+        source = new EventSource(button.dataset.url);
+        source.onopen = function () {
+            connected = true;
+            // Catch up with the changes made while the stream was reconnecting
+            if (opened) {
+                document.getElementById("push-refresh").click();
+            }
+            opened = true;
+        };
+        // EventSource reconnects by itself, polling covers the gap
+        source.onerror = function () {
+            connected = false;
+            // A refused stream, such as a server at its stream limit, is not
+            // reopened by EventSource: keep polling and try again later
+            if (source.readyState === EventSource.CLOSED) {
+                setTimeout(function () {
+                    source = null;
+                    connect();
+                }, REFUSED_RETRY);
+            }
+        };
+        source.addEventListener("change", function () {
+            document.getElementById("push-refresh").click();
+        });
+    }
+
+    new MutationObserver(connect).observe(document.documentElement, {childList: true, subtree: true});
+})();
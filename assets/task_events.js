@@ -0,0 +1,66 @@
+/* Task item events: send the server only the item that was clicked */
+
+// Last value seen of every task checkbox, by task ID
+var knownChecks = {};
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    task_events: {
+        // Turn a click on a checkbox, edit or delete button into an event of its task
+        item_event: function (checkValues, editClicks, deleteClicks) {
+            var clientside = window.dash_clientside;
+            var context = clientside.callback_context;
+            var previousChecks = knownChecks;
+            knownChecks = {};
+            (context.inputs_list[0] || []).forEach(function (input) {
+                knownChecks[input.id.index] = input.value;
+            });
+
+            // A click triggers a single item, rendering a list triggers all of its new items
+            var triggered = context.triggered;
+            if (triggered.length !== 1) {
+                throw clientside.PreventUpdate;
+            }
+            triggered = triggered[0];
+            if (triggered.value === null || triggered.value === undefined) {
+                throw clientside.PreventUpdate;
+            }
+
+            var propId = triggered.prop_id;
+            var id = JSON.parse(propId.slice(0, propId.lastIndexOf(".")));
+            // New buttons of a re-rendered list report zero clicks
+            if (id.type !== "task-checkbox" && !triggered.value) {
+                throw clientside.PreventUpdate;
+            }
+            // A re-rendered checkbox reports the value it already had
+            if (id.type === "task-checkbox" && previousChecks[id.index] === triggered.value) {
+                throw clientside.PreventUpdate;
+            }
+
+            // The time makes a repeated click on the same item a new event
+            var event = {index: id.index, value: triggered.value, time: Date.now()};
+            return [
+                id.type === "task-checkbox" ? event : clientside.no_update,
+                id.type === "edit-task" ? event : clientside.no_update,
+                id.type === "delete-task" ? event : clientside.no_update
+            ];
+        },
+
+        // Collect the IDs of the selected tasks for a bulk action
+        bulk_event: function (nClicks, selectAll, selectValues, selectIds) {
+            if (!nClicks) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            var listed = (selectIds || []).map(function (id) {
+                return id.index;
+            });
+            return {
+                selected: listed.filter(function (index, position) {
+                    return selectValues[position];
+                }),
+                // Every listed task is only needed for select all over search results
+                listed: selectAll ? listed : [],
+                time: Date.now()
+            };
+        }
+    }
+});
@@ -0,0 +1,72 @@
+/* Windowed task list: show the window buttons and load pages while scrolling */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    task_list: {
+        window_buttons: function (taskWindow) {
+            var hidden = {display: "none"};
+            if (!taskWindow || !taskWindow.pages || !taskWindow.pages.length) {
+                return [hidden, hidden];
+            }
+            return [
+                taskWindow.offset > 0 ? {} : hidden,
+                taskWindow.has_next ? {} : hidden
+            ];
+        }
+    }
+});
+
+(function () {
+    var BUTTON_IDS = ["load-previous-tasks", "load-more-tasks"];
+    var viewport = null;
+    var visibility = null;
+    var listChanges = null;
+
+    // Click a window button once it scrolls within 300px of the viewport
+    function loadVisible(entries) {
+        entries.forEach(function (entry) {
+            var button = entry.target;
+            if (entry.isIntersecting && button.offsetParent !== null && !button.dataset.loading) {
+                button.dataset.loading = "true";
+                button.click();
+            }
+        });
+    }
+
+    // Re-arm the buttons after a page landed, observing again re-checks their visibility
+    function rearm() {
+        BUTTON_IDS.forEach(function (id) {
+            var button = document.getElementById(id);
+            if (button) {
+                delete button.dataset.loading;
+                visibility.unobserve(button);
+                visibility.observe(button);
+            }
+        });
+    }
+
+    function attach() {
+        var current = document.getElementById("task-list-viewport");
+        if (current === viewport) {
+            return;
+        }
+        if (visibility) {
+            visibility.disconnect();
+            listChanges.disconnect();
+        }
+
+        viewport = current;
+        if (!viewport) {
+            return;
+        }
+        visibility = new IntersectionObserver(loadVisible, {root: viewport, rootMargin: "300px 0px"});
+        listChanges = new MutationObserver(rearm);
+        listChanges.observe(document.getElementById("task-list"), {childList: true});
+        // Showing or hiding a button changes its style attribute
+        BUTTON_IDS.forEach(function (id) {
+            listChanges.observe(document.getElementById(id), {attributes: true, attributeFilter: ["style"]});
+        });
+        rearm();
+    }
+
+    new MutationObserver(attach).observe(document.documentElement, {childList: true, subtree: true});
+})();
@@ -0,0 +1,135 @@
+/* Client rendering mode: build the task list items from compact task rows */
+
+(function () {
+    var PRIORITIES = {1: ["Low", "info"], 2: ["Medium", "warning"], 3: ["High", "danger"]};
+    var renderedAt = null;
+
+    function html(type, props) {
+        return {namespace: "dash_html_components", type: type, props: props};
+    }
+
+    function dbc(type, props) {
+        return {namespace: "dash_bootstrap_components", type: type, props: props};
+    }
+
+    function message(text, className) {
+        return dbc("ListGroupItem", {children: text, className: className});
+    }
+
+    // Selection and open descriptions of the rendered items by task ID
+    function itemStates(children) {
+        var states = {};
+        (children || []).forEach(function (item) {
+            var id = item && item.props && item.props.id;
+            if (id && id.type === "task-item") {
+                states[id.index] = {
+                    selected: item.props.children[0].props.value,
+                    open: item.props.children[4].props.is_open
+                };
+            }
+        });
+        return states;
+    }
+
+    function taskItem(task, categories, state) {
+        var priority = PRIORITIES[task.priority] || PRIORITIES[2];
+        var category = task.category_id === null ? null : categories[task.category_id];
+        var due = "";
+        if (task.due_date) {
+            due = task.overdue
+                ? html("Span", {children: "Due: " + task.due_date + " (Overdue)", className: "text-danger ms-2"})
+                : html("Span", {children: "Due: " + task.due_date, className: "text-muted ms-2"});
+        }
+
+        return dbc("ListGroupItem", {
+            id: {type: "task-item", index: task.id},
+            action: true,
+            className: "d-flex justify-content-between align-items-center",
+            children: [
+                dbc("Checkbox", {
+                    id: {type: "task-select", index: task.id},
+                    value: Boolean(state.selected),
+                    className: "float-start me-2 task-select"
+                }),
+                dbc("Checkbox", {
+                    id: {type: "task-checkbox", index: task.id},
+                    value: task.completed,
+                    className: "float-start me-2"
+                }),
+                html("Div", {
+                    className: "d-inline-block",
+                    children: [
+                        html("Span", {
+                            children: task.title,
+                            style: task.completed ? {textDecoration: "line-through", opacity: "0.7"} : {}
+                        }),
+                        html("Span", {children: priority[0], className: "badge bg-" + priority[1] + " ms-2"}),
+                        category ? html("Span", {
+                            children: category[0],
+                            className: "badge rounded-pill",
+                            style: {backgroundColor: category[1], color: "white", marginLeft: "0.5rem"}
+                        }) : null,
+                        due
+                    ]
+                }),
+                html("Div", {
+                    className: "float-end",
+                    children: [
+                        html("Button", {
+                            id: {type: "edit-task", index: task.id},
+                            className: "btn btn-sm btn-outline-primary me-1",
+                            title: "Edit Task",
+                            children: html("I", {className: "fas fa-edit"})
+                        }),
+                        html("Button", {
+                            id: {type: "delete-task", index: task.id},
+                            className: "btn btn-sm btn-outline-danger",
+                            title: "Delete Task",
+                            children: html("I", {className: "fas fa-trash"})
+                        })
+                    ]
+                }),
+                dbc("Collapse", {
+                    id: {type: "task-description", index: task.id},
+                    is_open: Boolean(state.open),
+                    children: dbc("Card", {className: "mt-2", children: dbc("CardBody", {children: task.description})})
+                })
+            ]
+        });
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        task_rows: {
+            render: function (data, children) {
+                if (!data) {
+                    return window.dash_clientside.no_update;
+                }
+
+                // Patches keep the state of the rendered items, full renders reset it
+                var states = data.rendered_at === renderedAt ? itemStates(children) : {};
+                renderedAt = data.rendered_at;
+
+                var items = data.rows.map(function (row) {
+                    var task = {};
+                    data.columns.forEach(function (column, index) {
+                        task[column] = row[index];
+                    });
+                    return taskItem(task, data.categories, states[task.id] || {});
+                });
+
+                if (!items.length) {
+                    return [data.search
+                        ? message("No tasks match the search.", "text-center font-italic")
+                        : message("No tasks found. Add a new task to get started!", "text-center font-italic")];
+                }
+                if (data.search && data.has_more) {
+                    items.push(message(
+                        "Showing the " + items.length + " best matches, refine the search to find other tasks.",
+                        "text-center text-muted small"
+                    ));
+                }
+                return items;
+            }
+        }
+    });
+})();
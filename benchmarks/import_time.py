@@ -0,0 +1,84 @@
+"""
+Check that importing the application stays within an import time budget.
+
+Imports app.py in a fresh interpreter with python -X importtime, several
+times, and fails when the fastest import takes longer than the budget, when
+a module that the app must not load at import (such as pandas) shows up, or
+when the import touched the database. Prints the slowest modules to show
+where the time goes.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget 1000 --runs 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules importing the app must not load
+FORBIDDEN_MODULES = ["pandas", "numpy"]
+
+
+def import_times(database):
+    """
+    Import the app in a new interpreter.
+    
+    Args:
+        database: Path of a SQLite database file that must not be created
+    
+    Returns:
+        A dict of module name to (self, cumulative) import time in microseconds
+    """
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}", DEBUG="False")
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stderr
+    
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def main(argv=None):
+    """Import the app and report whether it met the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=1200, help="Budget in milliseconds")
+    parser.add_argument("--runs", type=int, default=3, help="Imports, the fastest one counts")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    args = parser.parse_args(argv)
+    
+    database = os.path.join(tempfile.mkdtemp(), "import.db")
+    runs = [import_times(database) for _ in range(args.runs)]
+    times = min(runs, key=lambda times: times["app"][1])
+    total_ms = times["app"][1] / 1000
+    
+    print(f"{'self ms':>9}{'total ms':>10}  module")
+    for name, (own, cumulative) in sorted(times.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{own / 1000:>9.1f}{cumulative / 1000:>10.1f}  {name}")
+    print(f"import app: {total_ms:.0f} ms, budget {args.budget:.0f} ms")
+    
+    failures = []
+    if total_ms > args.budget:
+        failures.append(f"import took {total_ms:.0f} ms, over the budget of {args.budget:.0f} ms")
+    for module in FORBIDDEN_MODULES:
+        if module in times:
+            failures.append(f"import loaded {module}")
+    if os.path.exists(database):
+        failures.append("import opened the database")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
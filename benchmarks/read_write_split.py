@@ -0,0 +1,127 @@
+"""
+Compare read latency under concurrent writes with and without the read-only engine.
+
+Reader threads fetch task pages and statistics through TaskController while
+writer threads update tasks, the way concurrent Dash callbacks do. Each
+configuration runs in its own process against a fresh database filled by
+benchmarks/datagen.py, since SQLITE_READ_ONLY_ENGINE is read when the
+application is imported.
+
+Usage:
+    python benchmarks/read_write_split.py
+    python benchmarks/read_write_split.py --tasks 100000 --readers 16 --writers 2 --seconds 10
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datagen import seed_database
+
+CONFIGURATIONS = (
+    # One shared engine, as before the split
+    {"SQLITE_READ_ONLY_ENGINE": "false", "SQLITE_POOL_SIZE": "10"},
+    {"SQLITE_READ_ONLY_ENGINE": "true"},
+)
+
+
+def percentile(ordered, share):
+    """Return the nearest-rank percentile of sorted values."""
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def run_worker(tasks, readers, writers, seconds):
+    """Run the mixed workload in this process and print its result as JSON."""
+    seed_database(tasks)
+    sys.path.insert(0, ROOT)
+    from database.db import shutdown_db
+    from controllers.todo_controller import TaskController
+    
+    start_barrier = threading.Barrier(readers + writers)
+    deadline = []
+    read_timings = [[] for _ in range(readers)]
+    write_counts = [0] * writers
+    
+    def reader(number):
+        start_barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            started = time.perf_counter()
+            TaskController.get_tasks_page(completed=False)
+            TaskController.get_task_statistics()
+            read_timings[number].append((time.perf_counter() - started) * 1000)
+            shutdown_db()
+    
+    def writer(number):
+        generator = random.Random(number)
+        start_barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            TaskController.update_task(generator.randint(1, tasks), priority=generator.randint(1, 3))
+            write_counts[number] += 1
+            shutdown_db()
+    
+    threads = [threading.Thread(target=reader, args=(number,)) for number in range(readers)]
+    threads += [threading.Thread(target=writer, args=(number,)) for number in range(writers)]
+    deadline.append(time.perf_counter() + seconds)
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    timings = sorted(timing for thread_timings in read_timings for timing in thread_timings)
+    print(json.dumps({
+        "reads_per_second": round(len(timings) / seconds, 1),
+        "read_p50_ms": round(percentile(timings, 0.5), 2),
+        "read_p99_ms": round(percentile(timings, 0.99), 2),
+        "writes_per_second": round(sum(write_counts) / seconds, 1)
+    }))
+
+
+def main(argv=None):
+    """Run every configuration in a subprocess and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.worker:
+        run_worker(args.tasks, args.readers, args.writers, args.seconds)
+        return
+    
+    results = []
+    for configuration in CONFIGURATIONS:
+        database = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}", DEBUG="False", **configuration)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--tasks", str(args.tasks),
+             "--readers", str(args.readers), "--writers", str(args.writers),
+             "--seconds", str(args.seconds)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(dict(configuration, **json.loads(output.splitlines()[-1])))
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{'read-only engine':<18}{'reads/s':>9}{'read p50 ms':>13}{'read p99 ms':>13}{'writes/s':>10}")
+    for result in results:
+        print(
+            f"{result['SQLITE_READ_ONLY_ENGINE']:<18}{result['reads_per_second']:>9}"
+            f"{result['read_p50_ms']:>13}{result['read_p99_ms']:>13}{result['writes_per_second']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Measure the request bodies the browser sends when a task item is clicked.
+
+Clicks on a checkbox, edit or delete button of the task list, and the bulk
+action button, used to trigger callbacks with ALL wildcard inputs, so each
+request carried the value (and for some the ID) of every rendered item. They
+now go through small event stores filled in the browser. For several numbers
+of rendered tasks this prints the size and decode time of the request body
+before and after, built like dash-renderer builds them. The bodies after are
+also posted to the application to check that it accepts them.
+
+Usage:
+    python benchmarks/request_payload.py
+    python benchmarks/request_payload.py --rendered 50 200 1000 5000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datagen import seed_database
+
+# Outputs of the list callbacks, shared by both versions
+LIST_OUTPUTS = [("task-list", "children"), ("task-list-window", "data"), ("app-state", "data")]
+LIST_STATE = ["filter-completed.value", "task-list-window.data", "app-state.data", "task-search.value"]
+
+
+def prop(component_id, name, value):
+    """Return a callback input or state as dash-renderer sends it."""
+    return {"id": component_id, "property": name, "value": value}
+
+
+def item_props(item_type, name, task_ids, value):
+    """Return the values of an ALL wildcard over the items of every task."""
+    return [prop({"index": task_id, "type": item_type}, name, value(task_id)) for task_id in task_ids]
+
+
+def prop_id(component_id, name):
+    """Return the prop_id string of a component property."""
+    if isinstance(component_id, dict):
+        component_id = json.dumps(component_id, sort_keys=True, separators=(",", ":"))
+    return f"{component_id}.{name}"
+
+
+def request_body(outputs, inputs, state, changed):
+    """Return the JSON body of a callback request."""
+    names = [prop_id(component_id, name) for component_id, name in outputs]
+    outputs = [{"id": component_id, "property": name} for component_id, name in outputs]
+    return json.dumps({
+        "output": f"..{'...'.join(names)}.." if len(names) > 1 else names[0],
+        "outputs": outputs if len(outputs) > 1 else outputs[0],
+        "inputs": inputs,
+        "changedPropIds": changed,
+        "state": state
+    }, separators=(",", ":"))
+
+
+def list_state(values, names=LIST_STATE):
+    """Return the state shared by the list callbacks."""
+    return [prop(*name.split("."), values[name]) for name in names]
+
+
+def bodies_before(task_ids, values):
+    """Build the request bodies of the ALL wildcard callbacks."""
+    clicked = task_ids[len(task_ids) // 2]
+    item_ids = lambda item_type: item_props(item_type, "id", task_ids, lambda task_id: {
+        "index": task_id, "type": item_type
+    })
+    return {
+        "toggle": request_body(
+            LIST_OUTPUTS,
+            [item_props("task-checkbox", "value", task_ids, lambda task_id: task_id == clicked)],
+            [item_ids("task-checkbox")] + list_state(values),
+            [prop_id({"index": clicked, "type": "task-checkbox"}, "value")]
+        ),
+        "edit": request_body(
+            [("task-form-container", "children")],
+            [item_props("edit-task", "n_clicks", task_ids, lambda task_id: 1 if task_id == clicked else None)],
+            [],
+            [prop_id({"index": clicked, "type": "edit-task"}, "n_clicks")]
+        ),
+        "delete": request_body(
+            LIST_OUTPUTS,
+            [item_props("delete-task", "n_clicks", task_ids, lambda task_id: 1 if task_id == clicked else None)],
+            list_state(values),
+            [prop_id({"index": clicked, "type": "delete-task"}, "n_clicks")]
+        ),
+        "bulk action": request_body(
+            LIST_OUTPUTS + [("select-all-tasks", "value")],
+            [prop("apply-bulk-action", "n_clicks", 1)],
+            [prop("bulk-action", "value", "complete"), prop("select-all-tasks", "value", False),
+             item_props("task-select", "value", task_ids, lambda task_id: task_id % 10 == 0),
+             item_ids("task-select")]
+            + list_state(values, ["filter-completed.value", "task-search.value"]),
+            ["apply-bulk-action.n_clicks"]
+        ),
+    }
+
+
+def bodies_after(task_ids, values):
+    """Build the request bodies of the event store callbacks."""
+    clicked = task_ids[len(task_ids) // 2]
+    event = lambda value: {"index": clicked, "value": value, "time": int(time.time() * 1000)}
+    return {
+        "toggle": request_body(
+            LIST_OUTPUTS,
+            [prop("task-toggle-event", "data", event(False))],
+            list_state(values),
+            ["task-toggle-event.data"]
+        ),
+        "edit": request_body(
+            [("task-form-container", "children")],
+            [prop("task-edit-event", "data", event(1))],
+            [],
+            ["task-edit-event.data"]
+        ),
+        "delete": request_body(
+            LIST_OUTPUTS,
+            [prop("task-delete-event", "data", event(1))],
+            list_state(values),
+            ["task-delete-event.data"]
+        ),
+        "bulk action": request_body(
+            LIST_OUTPUTS + [("select-all-tasks", "value")],
+            [prop("bulk-action-event", "data", {
+                "selected": [task_id for task_id in task_ids if task_id % 10 == 0],
+                "listed": [],
+                "time": int(time.time() * 1000)
+            })],
+            [prop("bulk-action", "value", "complete"), prop("select-all-tasks", "value", False)]
+            + list_state(values, ["filter-completed.value", "task-search.value"]),
+            ["bulk-action-event.data"]
+        ),
+    }
+
+
+def decode_ms(body, runs=20):
+    """Return the median time to decode a request body."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        json.loads(body)
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[runs // 2]
+
+
+def with_hashes(body, app):
+    """Give a body the output string of the registered callback with its input."""
+    request = json.loads(body)
+    for output, callback in app.callback_map.items():
+        if callback["inputs"] == [{"id": request["inputs"][0]["id"], "property": "data"}]:
+            request["output"] = output
+    return request
+
+
+def main(argv=None):
+    """Print the request sizes for every number of rendered tasks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rendered", type=int, nargs="+", default=[50, 200, 1000, 5000],
+                        help="Numbers of task items rendered in the browser")
+    args = parser.parse_args(argv)
+    
+    database = os.path.join(tempfile.mkdtemp(), "payload.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["DEBUG"] = "False"
+    seed_database(max(args.rendered))
+    sys.path.insert(0, ROOT)
+    
+    import app
+    from database.db import shutdown_db
+    from controllers.todo_controller import TaskController
+    
+    _, window, _ = app.first_task_page(False)
+    values = {
+        "filter-completed.value": False,
+        "task-list-window.data": window,
+        "app-state.data": {"tasks": app.view_revision()},
+        "task-search.value": None
+    }
+    task_ids = [task.id for task in TaskController.get_tasks_page(limit=max(args.rendered))[0]]
+    shutdown_db()
+    client = app.app.server.test_client()
+    
+    print(f"{'rendered':>8}  {'click':<12}{'bytes before':>14}{'bytes after':>13}"
+          f"{'decode ms before':>18}{'decode ms after':>17}")
+    for rendered in args.rendered:
+        before = bodies_before(task_ids[:rendered], values)
+        after = bodies_after(task_ids[:rendered], values)
+        for click, body in after.items():
+            response = client.post("/_dash-update-component", json=with_hashes(body, app.app))
+            if response.status_code not in (200, 204):
+                raise SystemExit(f"{click} request failed with {response.status_code}")
+            values["app-state.data"] = {"tasks": app.view_revision()}
+            print(
+                f"{rendered:>8}  {click:<12}{len(before[click]):>14}{len(body):>13}"
+                f"{decode_ms(before[click]):>18.3f}{decode_ms(body):>17.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure the latency of TaskController.search_tasks() on a large task list.
+
+Tasks get random titles and descriptions from a vocabulary of a few common
+and many rare words. Each query runs several times and the median and
+worst latencies are reported.
+
+Usage:
+    python benchmarks/search_latency.py
+    python benchmarks/search_latency.py --tasks 1000000 --json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+COMMON_WORDS = "buy call email fix plan review send write update check".split()
+QUERIES = ["buy", "review email", "w123", "w12", "w1", "bu", "missing", "call w42"]
+
+
+def main(argv=None):
+    """Fill a fresh database and time the search queries."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5, help="Runs per query")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+    
+    # The database is chosen when the application modules are imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    sys.path.insert(0, ROOT)
+    from database.db import init_db
+    from controllers.todo_controller import TaskController
+    
+    init_db()
+    rare_words = [f"w{number}" for number in range(5000)]
+    generator = random.Random(1)
+    
+    def text(length):
+        return " ".join(
+            generator.choice(COMMON_WORDS if generator.random() < 0.2 else rare_words)
+            for _ in range(length)
+        )
+    
+    for start in range(0, args.tasks, 10000):
+        TaskController.bulk_create_tasks([
+            {
+                "title": text(4),
+                "description": text(10),
+                "completed": generator.random() < 0.5
+            }
+            for _ in range(min(10000, args.tasks - start))
+        ])
+    
+    results = []
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            tasks, has_more = TaskController.search_tasks(query, completed=False)
+            timings.append((time.perf_counter() - started) * 1000)
+        results.append({
+            "query": query,
+            "results": len(tasks),
+            "has_more": has_more,
+            "median_ms": round(statistics.median(timings), 2),
+            "max_ms": round(max(timings), 2)
+        })
+    
+    if args.json:
+        print(json.dumps({"tasks": args.tasks, "queries": results}, indent=2))
+        return
+    
+    print(f"{args.tasks} tasks")
+    print(f"{'query':<16}{'results':>8}{'median ms':>11}{'max ms':>9}")
+    for result in results:
+        print(f"{result['query']:<16}{result['results']:>8}{result['median_ms']:>11}{result['max_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
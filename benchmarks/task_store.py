@@ -0,0 +1,112 @@
+"""
+Compare the task list reads with and without the in-memory task store.
+
+Times the first and a deep page of the task list, the position of a task,
+the statistics, and a page read right after a task was updated, which makes
+the store read the changed row again. Each configuration runs in its own
+process against a fresh database filled by benchmarks/datagen.py, since
+TASK_STORE is read when the application is imported.
+
+Usage:
+    python benchmarks/task_store.py
+    python benchmarks/task_store.py --tasks 100000 --runs 200
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datagen import seed_database
+
+CONFIGURATIONS = (
+    {"TASK_STORE": "false"},
+    {"TASK_STORE": "true"},
+)
+
+
+def median_ms(function, runs):
+    """Return the median duration of function(run) in milliseconds."""
+    timings = []
+    for run in range(runs):
+        started = time.perf_counter()
+        function(run)
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[runs // 2]
+
+
+def run_worker(tasks, runs):
+    """Time the reads in this process and print the results as JSON."""
+    seed_database(tasks)
+    sys.path.insert(0, ROOT)
+    from database.db import shutdown_db
+    from controllers.todo_controller import TaskController
+    
+    started = time.perf_counter()
+    first_page, cursor = TaskController.get_tasks_page(completed=False)
+    load_ms = (time.perf_counter() - started) * 1000
+    for _ in range(tasks // 2 // len(first_page)):
+        cursor = TaskController.get_tasks_page(cursor=cursor, completed=False)[1] or cursor
+    generator = random.Random(0)
+    task_ids = [generator.randint(1, tasks) for _ in range(runs)]
+    
+    def after_update(run):
+        TaskController.update_task(task_ids[run], priority=generator.randint(1, 3))
+        TaskController.get_tasks_page(completed=False)
+    
+    reads = {
+        "first page": lambda run: TaskController.get_tasks_page(completed=False),
+        "deep page": lambda run: TaskController.get_tasks_page(cursor=cursor, completed=False),
+        "position": lambda run: TaskController.get_task_position(task_ids[run], completed=False),
+        "statistics": lambda run: TaskController.get_task_statistics(),
+        "update + page": after_update,
+    }
+    results = {"first read": round(load_ms, 2)}
+    for name, read in reads.items():
+        results[name] = round(median_ms(read, runs), 3)
+        shutdown_db()
+    print(json.dumps(results))
+
+
+def main(argv=None):
+    """Run every configuration in a subprocess and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.worker:
+        run_worker(args.tasks, args.runs)
+        return
+    
+    results = []
+    for configuration in CONFIGURATIONS:
+        database = os.path.join(tempfile.mkdtemp(), "bench.db")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}", DEBUG="False", **configuration)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--tasks", str(args.tasks),
+             "--runs", str(args.runs)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(dict(configuration, **json.loads(output.splitlines()[-1])))
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    names = [name for name in results[0] if name != "TASK_STORE"]
+    print(f"{'median ms':<16}" + "".join(f"{'store ' + result['TASK_STORE']:>14}" for result in results))
+    for name in names:
+        print(f"{name:<16}" + "".join(f"{result[name]:>14}" for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compare the write throughput of the SQLite engine profiles.
+
+Every thread commits single task inserts through its own session, the way
+concurrent Dash callbacks do. Each profile runs against a fresh database in
+a temporary directory.
+
+Usage:
+    python benchmarks/write_throughput.py
+    python benchmarks/write_throughput.py --threads 8 --commits 200 --json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from database.db import Base, create_db_engine
+from models.todo import Task
+
+
+def run_profile(profile, pool, threads, commits):
+    """
+    Run the write workload against a fresh database.
+    
+    Returns:
+        A dict with the commits, lock errors, elapsed seconds and commits per second
+    """
+    directory = tempfile.mkdtemp()
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", profile, pool)
+    Base.metadata.create_all(bind=engine)
+    
+    committed = []
+    errors = []
+    start_barrier = threading.Barrier(threads)
+    
+    def worker(number):
+        done = failed = 0
+        start_barrier.wait()
+        for index in range(commits):
+            with Session(engine) as session:
+                session.add(Task(title=f"Task {number}-{index}", priority=2))
+                try:
+                    session.commit()
+                    done += 1
+                except OperationalError:
+                    # "database is locked" once the busy timeout expired
+                    session.rollback()
+                    failed += 1
+        committed.append(done)
+        errors.append(failed)
+    
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    
+    total = sum(committed)
+    return {
+        "profile": profile,
+        "pool": pool,
+        "threads": threads,
+        "commits": total,
+        "lock_errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "commits_per_second": round(total / elapsed, 1)
+    }
+
+
+def main(argv=None):
+    """Run every profile and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--commits", type=int, default=100, help="Commits per thread")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+    
+    results = [
+        run_profile(profile, pool, args.threads, args.commits)
+        for profile, pool in (("default", "queue"), ("production", "queue"), ("production", "null"))
+    ]
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{'profile':<12}{'pool':<8}{'commits':>9}{'errors':>8}{'seconds':>10}{'commits/s':>12}")
+    for result in results:
+        print(
+            f"{result['profile']:<12}{result['pool']:<8}{result['commits']:>9}"
+            f"{result['lock_errors']:>8}{result['seconds']:>10}{result['commits_per_second']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Command line tools for the To-Do application.
+
+Usage:
+    python cli.py import tasks.csv
+    python cli.py import tasks.jsonl --batch-size 5000
+    python cli.py export tasks.csv
+    python cli.py export - --format jsonl
+"""
+import argparse
+import os
+import sys
+
+from config import BULK_BATCH_SIZE
+from database.db import init_db, shutdown_db
+from controllers.transfer_controller import TransferController, TaskImportError, FORMATS
+
+
+def guess_format(path, default="csv"):
+    """Guess the format of a file from its extension."""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    return extension if extension in FORMATS else default
+
+
+def import_command(args):
+    """Import tasks from a file, - reads standard input."""
+    file_format = args.format or guess_format(args.path)
+    try:
+        if args.path == "-":
+            count = TransferController.import_tasks(sys.stdin, file_format, args.batch_size)
+        else:
+            with open(args.path, newline="", encoding="utf-8") as stream:
+                count = TransferController.import_tasks(stream, file_format, args.batch_size)
+    except TaskImportError as error:
+        print(f"Import failed: {error}", file=sys.stderr)
+        print(f"Imported {error.imported} tasks before the failure", file=sys.stderr)
+        sys.exit(1)
+    print(f"Imported {count} tasks", file=sys.stderr)
+
+
+def export_command(args):
+    """Export tasks to a file, - writes standard output."""
+    file_format = args.format or guess_format(args.path)
+    chunks = TransferController.export_tasks(file_format, args.batch_size)
+    if args.path == "-":
+        sys.stdout.writelines(chunks)
+    else:
+        with open(args.path, "w", newline="", encoding="utf-8") as stream:
+            stream.writelines(chunks)
+
+
+def main(argv=None):
+    """Run the command given on the command line."""
+    parser = argparse.ArgumentParser(description="To-Do application tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    for name, function, help_text in (
+        ("import", import_command, "Import tasks from CSV or JSON Lines"),
+        ("export", export_command, "Export tasks to CSV or JSON Lines")
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("path", help="File path, - for standard input or output")
+        command.add_argument("--format", choices=sorted(FORMATS),
+                             help="File format, guessed from the extension by default")
+        command.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                             help="Tasks per database batch")
+        command.set_defaults(function=function)
+    
+    args = parser.parse_args(argv)
+    init_db()
+    try:
+        args.function(args)
+    finally:
+        shutdown_db()
+
+
+if __name__ == "__main__":
+    main()
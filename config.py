@@ -12,10 +12,78 @@ SQLITE_DB_PATH = os.path.join(BASE_DIR, 'todo.db')
 SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', f'sqlite:///{SQLITE_DB_PATH}')
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+# SQLite engine profile: 'production' applies SQLITE_PRAGMAS to every new
+# connection, 'default' keeps SQLite's rollback journal and full fsyncs
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),  # WAL stays consistent, fsync at checkpoints
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # bytes
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),  # negative: KiB per connection
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # milliseconds
+    'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+
+# Connection pool: 'queue' reuses SQLITE_POOL_SIZE connections across the
+# threads of one process, 'null' opens a connection per checkout so nothing
+# is shared between forked worker processes
+SQLITE_POOL = os.environ.get('SQLITE_POOL', 'queue')
+SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', 4))  # writer connections, SQLite commits one at a time
+
+# Read/write split: the reads of the controllers go to a separate engine whose
+# connections open the SQLite file read-only, so in WAL mode they run
+# concurrently with each other and with the writer
+SQLITE_READ_ONLY_ENGINE = os.environ.get('SQLITE_READ_ONLY_ENGINE', 'True').lower() == 'true'
+SQLITE_READ_POOL_SIZE = int(os.environ.get('SQLITE_READ_POOL_SIZE', 32))  # about one per server thread
+
+# Write-behind mode: controller mutations are queued to one writer thread that
+# commits up to WRITE_BATCH_SIZE of them together, waiting at most
+# WRITE_BATCH_DELAY milliseconds for a batch to fill up
+WRITE_BEHIND = os.environ.get('WRITE_BEHIND', 'False').lower() == 'true'
+WRITE_BATCH_SIZE = int(os.environ.get('WRITE_BATCH_SIZE', 64))
+WRITE_BATCH_DELAY = float(os.environ.get('WRITE_BATCH_DELAY', 2))
+
+# In-memory task store: every process holds the tasks in indexed rows and
+# serves the task list, its positions and the statistics without querying
+# SQLite (SQLite files only)
+TASK_STORE = os.environ.get('TASK_STORE', 'False').lower() == 'true'
+
 # Application settings
 DEBUG = os.environ.get('DEBUG', 'True').lower() == 'true'
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-key-for-development-only')
 
+# Warn when a callback repeats the same query this many times (debug mode only)
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))
+
+# Log statements slower than SLOW_QUERY_MS (0 disables) with their query plan,
+# keeping the last SLOW_QUERY_LOG_SIZE for /debug/slow-queries
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+SLOW_QUERY_LOG_SIZE = int(os.environ.get('SLOW_QUERY_LOG_SIZE', 50))
+
 # Dash settings
 DASH_TITLE = 'To-Do Application'
-DASH_UPDATE_INTERVAL = 5000  # milliseconds
+DASH_UPDATE_INTERVAL = int(os.environ.get('DASH_UPDATE_INTERVAL', 30000))  # milliseconds, polling fallback
+TASK_PAGE_SIZE = int(os.environ.get('TASK_PAGE_SIZE', 50))  # tasks per list page
+TASK_WINDOW_PAGES = int(os.environ.get('TASK_WINDOW_PAGES', 4))  # pages kept in the browser
+TASK_ITEM_CACHE_SIZE = int(os.environ.get('TASK_ITEM_CACHE_SIZE', 1024))  # rendered task items kept
+SEARCH_CANDIDATES = int(os.environ.get('SEARCH_CANDIDATES', 500))  # newest matches ranked per search
+# Task list rendering: 'server' sends rendered list items, 'client' sends
+# compact task rows that the browser renders (assets/task_rows.js)
+TASK_LIST_RENDERING = os.environ.get('TASK_LIST_RENDERING', 'server')
+
+# Push updates: browsers listen to an event stream and refresh when the data
+# changed, polling every DASH_UPDATE_INTERVAL only while the stream is down
+PUSH_UPDATES = os.environ.get('PUSH_UPDATES', 'True').lower() == 'true'
+PUSH_CHECK_INTERVAL = float(os.environ.get('PUSH_CHECK_INTERVAL', 1.0))  # seconds between checks for other processes' commits
+PUSH_STREAM_TIMEOUT = int(os.environ.get('PUSH_STREAM_TIMEOUT', 300))  # seconds before a stream is closed and reopened
+PUSH_MAX_STREAMS = int(os.environ.get('PUSH_MAX_STREAMS', 16))  # open streams per process, browsers over it poll
+
+# Record callback and database metrics and serve them on /metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+# Directory where every worker process writes its metrics, so that /metrics
+# serves the sum over all workers; unset serves the metrics of one process
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_WRITE_INTERVAL = float(os.environ.get('METRICS_WRITE_INTERVAL', 5))  # seconds between writes
+
+# Bulk import and export settings
+BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 1000))  # tasks per insert statement
@@ -1,3 +1,4 @@
 from controllers.todo_controller import TaskController, CategoryController
+from controllers.transfer_controller import TransferController
 
-__all__ = ['TaskController', 'CategoryController']
+__all__ = ['TaskController', 'CategoryController', 'TransferController']
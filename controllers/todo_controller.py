@@ -1,23 +1,660 @@
+from concurrent.futures import Future
 from datetime import datetime
-from database.db import db_session
-from models.todo import Task, Category
+from heapq import heapify, heappop, heappush
+from sqlalchemy import case, column, delete, func, insert, or_, table, tuple_, update
+from sqlalchemy.orm import joinedload
+import re
+import threading
+
+from config import TASK_PAGE_SIZE, SEARCH_CANDIDATES
+from database.db import db_session, read_session, data_version, engine, task_changes
+from database.task_store import task_store
+from database.write_queue import write_queue
+from models.todo import Task, Category, CategoryRow
+
+
+# The task list is sorted on (completed, due_date, id) with undated tasks
+# first. Each (completed, dated) segment of that order is one contiguous
+# range of the (..., completed, due_date) indexes on the tasks table.
+_TASK_SEGMENTS = ((False, False), (False, True), (True, False), (True, True))
+
+
+def _parse_cursor(cursor):
+    """Split a keyset cursor into its segment index and (due_date, id) key."""
+    completed, due_date, task_id = cursor
+    segment = _TASK_SEGMENTS.index((bool(completed), due_date is not None))
+    return segment, (datetime.fromisoformat(due_date) if due_date else None, task_id)
+
+
+def _task_segment(query, completed, dated, after=None, before=None):
+    """
+    Restrict a task query to one segment of the task list order.
+    
+    Args:
+        query: Task query to restrict
+        completed: Completion status of the segment
+        dated: Whether the segment holds the tasks with a due date
+        after: Only keep tasks sorting after this (due_date, id) key
+        before: Only keep tasks sorting before this (due_date, id) key
+    
+    Returns:
+        The restricted query
+    """
+    query = query.filter(Task.completed == completed)
+    if not dated:
+        query = query.filter(Task.due_date.is_(None))
+        if after:
+            query = query.filter(Task.id > after[1])
+        if before:
+            query = query.filter(Task.id < before[1])
+        return query
+    
+    query = query.filter(Task.due_date.isnot(None))
+    if after:
+        query = query.filter(tuple_(Task.due_date, Task.id) > tuple_(*after))
+    if before:
+        query = query.filter(tuple_(Task.due_date, Task.id) < tuple_(*before))
+    return query
+
+
+def _segment_order(dated):
+    """Return the ordering of the tasks within one segment."""
+    return (Task.due_date, Task.id) if dated else (Task.id,)
+
+
+def _filtered_segments(filters, stop=None):
+    """Yield the (index, completed, dated) segments allowed by the filters."""
+    completed_filter = filters.get("completed")
+    for index, (completed, dated) in enumerate(_TASK_SEGMENTS[:stop]):
+        if completed_filter is None or completed == bool(completed_filter):
+            yield index, completed, dated
+
+
+# Full-text search index of the tasks, see database/db.py
+_tasks_fts = table("tasks_fts", column("rowid"), column("rank"), column("tasks_fts"))
+
+
+def _match_query(terms):
+    """
+    Turn user input into an FTS5 query matching tasks with every word.
+    
+    Words are quoted so FTS5 operators in the input are taken literally, the
+    last word also matches as a prefix while it is still being typed, unless
+    it is a single character which would expand into too many terms.
+    """
+    words = re.findall(r"\w+", terms)
+    if not words:
+        return None
+    query = " ".join(f'"{word}"' for word in words)
+    return query + "*" if len(words[-1]) > 1 else query
+
+
+# Task columns that bulk updates may set
+_BULK_UPDATE_COLUMNS = ("completed", "priority", "category_id", "due_date")
+
+# Task IDs bound per IN (...) clause of a bulk statement, below SQLite's
+# historical limit of 999 variables per statement
+_BULK_ID_CHUNK = 500
+
+# Functions called with the ID of each task changed through the controllers,
+# or with None when any task may have changed
+_task_listeners = []
+
+
+def _notify_task_change(task_id):
+    """Tell the task listeners that a task was created, changed or deleted."""
+    for listener in _task_listeners:
+        listener(task_id)
+
+
+def _notify_task_changes(task_ids):
+    """Tell the task listeners about every task of a bulk change."""
+    for task_id in task_ids:
+        _notify_task_change(task_id)
+
+
+def _sync_task_changes():
+    """
+    Tell the task listeners about changes committed by other processes.
+    
+    Called before the reads whose tasks get rendered, so the per-process
+    caches of every server worker stay coherent.
+    """
+    changed = task_changes.poll()
+    if changed is None:
+        _notify_task_change(None)
+    else:
+        _notify_task_changes(changed)
+
+
+def _write(operation, after_commit=None, wait=True):
+    """
+    Apply a mutation and commit it.
+    
+    In write-behind mode the operation runs on the writer thread and is
+    committed together with other mutations (see database/write_queue.py).
+    
+    Args:
+        operation: Function changing db_session without committing
+        after_commit: Function called with the result once it is committed
+        wait: Wait for the commit, otherwise return a Future of the result
+    
+    Returns:
+        The result of operation(), or a Future of it when wait is False
+    """
+    if write_queue is None:
+        result = operation()
+        db_session.commit()
+        # Reads go through another session, which may hold the old rows
+        read_session.expire_all()
+        if after_commit is not None:
+            after_commit(result)
+        if wait:
+            return result
+        done = Future()
+        done.set_result(result)
+        return done
+    
+    done = Future()
+    
+    def finish(future):
+        try:
+            result = future.result()
+            if after_commit is not None:
+                after_commit(result)
+        except Exception as error:
+            done.set_exception(error)
+        else:
+            done.set_result(result)
+    
+    write_queue.submit(operation).add_done_callback(finish)
+    if not wait:
+        return done
+    
+    result = done.result()
+    # Expire what this thread's sessions loaded before the change
+    db_session.rollback()
+    read_session.expire_all()
+    return result
+
+
+class CategoryCatalog(object):
+    """
+    Cached list of all categories.
+    
+    The rows are read again after a category is changed through
+    CategoryController, and after SQLite's data_version shows that the
+    database was written to, which also catches changes made by other
+    processes. The version is bumped whenever the rows read differ from
+    the previous ones.
+    """
+    
+    def __init__(self):
+        self.version = 0
+        self._rows = None
+        self._stale = True
+        self._data_version = None
+        self._lock = threading.Lock()
+    
+    def invalidate(self):
+        """Read the categories again on the next access."""
+        with self._lock:
+            self._stale = True
+    
+    def rows(self):
+        """Return the categories ordered by name, reading them if stale."""
+        with self._lock:
+            current = data_version()
+            if self._stale or current != self._data_version:
+                # Read the version first so a concurrent write marks the rows stale
+                self._stale = False
+                self._data_version = current
+                rows = [
+                    CategoryRow(*row)
+                    for row in read_session.query(Category.id, Category.name, Category.color)
+                    .order_by(Category.name)
+                ]
+                if self._rows is not None and rows != self._rows:
+                    self.version += 1
+                self._rows = rows
+            return self._rows
+
+
+_category_catalog = CategoryCatalog()
+
+
+class DueTimeline(object):
+    """
+    Timeline of the due dates of the incomplete tasks.
+    
+    Tasks that are not overdue yet wait in a min-heap of (due_date, id), the
+    overdue ones are kept in a set. A task moves from the heap to the set as
+    soon as its due date has passed, so the overdue count and the time the
+    next task becomes overdue are read without a query. Tasks changed through
+    TaskController are read again on the next access; changes committed by
+    other processes come through the change log, and their new tasks are
+    found past the highest known task ID once data_version moved.
+    """
+    
+    def __init__(self):
+        self._heap = []
+        self._upcoming = {}
+        self._overdue = set()
+        self._changed = set()
+        self._stale = True
+        self._version = None
+        self._max_id = 0
+        self._lock = threading.Lock()
+    
+    def invalidate(self, task_id):
+        """Read a task again on the next access, every task when task_id is None."""
+        with self._lock:
+            if task_id is None:
+                self._stale = True
+            else:
+                self._changed.add(task_id)
+    
+    def overdue_count(self, now=None):
+        """Return the number of incomplete tasks due before now."""
+        _sync_task_changes()
+        with self._lock:
+            self._update(now or datetime.now())
+            return len(self._overdue)
+    
+    def next_transition(self, now=None):
+        """Return when the next task becomes overdue, None if no task is due after now."""
+        _sync_task_changes()
+        with self._lock:
+            self._update(now or datetime.now())
+            return self._heap[0][0] if self._heap else None
+    
+    def _update(self, now):
+        """Apply the changes since the last access and advance the timeline to now."""
+        version = data_version()
+        if self._stale:
+            self._load(now)
+        elif version != self._version or self._changed:
+            if version != self._version:
+                self._find_new_tasks()
+            self._refresh(now)
+        self._version = version
+        self._advance(now)
+    
+    def _load(self, now):
+        """Read the due dates of every incomplete task."""
+        # Clear the flags first so invalidations during the read are kept
+        self._stale = False
+        self._changed.clear()
+        self._max_id = read_session.query(func.max(Task.id)).scalar() or 0
+        self._upcoming = {}
+        self._overdue = set()
+        for task_id, due_date in read_session.query(Task.id, Task.due_date).filter(
+                Task.completed == False, Task.due_date.isnot(None)):
+            if due_date < now:
+                self._overdue.add(task_id)
+            else:
+                self._upcoming[task_id] = due_date
+        self._heap = [(due_date, task_id) for task_id, due_date in self._upcoming.items()]
+        heapify(self._heap)
+    
+    def _find_new_tasks(self):
+        """Mark the tasks created since the last access, by any process, as changed."""
+        # The highest ID comes along, SQLite gives it out again once deleted
+        highest = read_session.query(func.max(Task.id)).scalar_subquery()
+        task_ids = [
+            task_id for task_id, in read_session.query(Task.id)
+            .filter(or_(Task.id > self._max_id, Task.id == highest))
+        ]
+        self._changed.update(task_ids)
+        self._max_id = max(task_ids, default=0)
+    
+    def _refresh(self, now):
+        """Read the changed tasks again."""
+        task_ids = sorted(self._changed)
+        self._changed.clear()
+        for start in range(0, len(task_ids), _BULK_ID_CHUNK):
+            chunk = task_ids[start:start + _BULK_ID_CHUNK]
+            due_dates = dict(
+                read_session.query(Task.id, Task.due_date)
+                .filter(Task.id.in_(chunk), Task.completed == False, Task.due_date.isnot(None))
+            )
+            for task_id in chunk:
+                # Entries left in the heap are skipped once they reach the top
+                self._upcoming.pop(task_id, None)
+                self._overdue.discard(task_id)
+                due_date = due_dates.get(task_id)
+                if due_date is None:
+                    continue
+                if due_date < now:
+                    self._overdue.add(task_id)
+                else:
+                    self._upcoming[task_id] = due_date
+                    heappush(self._heap, (due_date, task_id))
+    
+    def _advance(self, now):
+        """Move the tasks whose due date passed to the overdue set."""
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            due_date, task_id = heappop(heap)
+            if self._upcoming.get(task_id) == due_date:
+                del self._upcoming[task_id]
+                self._overdue.add(task_id)
+        
+        # Drop the entries of changed tasks from the top, and from the whole
+        # heap once they make up most of it
+        while heap and self._upcoming.get(heap[0][1]) != heap[0][0]:
+            heappop(heap)
+        if len(heap) > 2 * len(self._upcoming) + 64:
+            self._heap = [(due_date, task_id) for task_id, due_date in self._upcoming.items()]
+            heapify(self._heap)
+
+
+_due_timeline = DueTimeline()
+_task_listeners.append(_due_timeline.invalidate)
+
 
 class TaskController:
     """Controller for task operations."""
     
+    @staticmethod
+    def add_change_listener(listener):
+        """Call listener with the task ID (None for all tasks) after every task mutation."""
+        _task_listeners.append(listener)
+        return listener
+    
     @staticmethod
     def get_all_tasks():
         """Get all tasks."""
-        return Task.query.order_by(Task.completed, Task.due_date).all()
+        if task_store is not None:
+            return task_store.all_tasks()
+        return (
+            read_session.query(Task).options(joinedload(Task.category))
+            .order_by(Task.completed, Task.due_date)
+            .all()
+        )
+    
+    @staticmethod
+    def filter_tasks(query, completed=None, category_id=None, priority=None,
+                     due_after=None, due_before=None):
+        """
+        Restrict a task query to the given filters.
+        
+        Args:
+            query: Task query to filter
+            completed: Only completed (True) or pending (False) tasks, None for both
+            category_id: Category ID to filter by
+            priority: Priority to filter by (1=Low, 2=Medium, 3=High)
+            due_after: Only tasks due on or after this datetime
+            due_before: Only tasks due before this datetime
+        
+        Returns:
+            The filtered query
+        """
+        if completed is not None:
+            query = query.filter(Task.completed == bool(completed))
+        if category_id:
+            query = query.filter(Task.category_id == category_id)
+        if priority:
+            query = query.filter(Task.priority == priority)
+        if due_after:
+            query = query.filter(Task.due_date >= due_after)
+        if due_before:
+            query = query.filter(Task.due_date < due_before)
+        return query
+    
+    @staticmethod
+    def get_tasks_page(cursor=None, limit=TASK_PAGE_SIZE, backwards=False, **filters):
+        """
+        Get one page of tasks ordered by completion status and due date.
+        
+        Pages are keyset-paginated on (completed, due_date, id), so fetching
+        a page costs the same wherever it sits in the list. The page is read
+        segment by segment (see _TASK_SEGMENTS) so every query is an index
+        range scan rather than a filtered scan plus sort. With TASK_STORE
+        enabled the page is read from the in-memory task store instead
+        (see database/task_store.py).
+        
+        Args:
+            cursor: Cursor returned with the previous page, None for the first page
+            limit: Maximum number of tasks in the page
+            backwards: Read the page sorting before the cursor instead of after it
+            **filters: Filters accepted by filter_tasks()
+        
+        Returns:
+            A (tasks, next_cursor) tuple with the tasks in list order,
+            next_cursor continues in the same direction and is None once the
+            end of the list is reached
+        """
+        _sync_task_changes()
+        if task_store is not None and task_store.supports(filters):
+            return task_store.page(cursor, limit, backwards, **filters)
+        # Categories are rendered with every task, load them in the same query
+        query = read_session.query(Task).options(joinedload(Task.category))
+        query = TaskController.filter_tasks(query, **filters)
+        
+        segments = list(_filtered_segments(filters))
+        if backwards:
+            segments.reverse()
+        start, key = _parse_cursor(cursor) if cursor else (None, None)
+        
+        tasks = []
+        for index, completed, dated in segments:
+            if start is not None and (index > start if backwards else index < start):
+                continue
+            
+            bound = key if index == start else None
+            order = _segment_order(dated)
+            if backwards:
+                segment = _task_segment(query, completed, dated, before=bound)
+                order = [column.desc() for column in order]
+            else:
+                segment = _task_segment(query, completed, dated, after=bound)
+            
+            tasks.extend(segment.order_by(*order).limit(limit + 1 - len(tasks)).all())
+            if len(tasks) > limit:
+                break
+        
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = TaskController.get_task_cursor(tasks[-1])
+        if backwards:
+            tasks.reverse()
+        return tasks, next_cursor
+    
+    @staticmethod
+    def get_task_cursor(task):
+        """Get the JSON-serializable keyset cursor of a task."""
+        due_date = task.due_date.isoformat() if task.due_date else None
+        return [bool(task.completed), due_date, task.id]
+    
+    @staticmethod
+    def cursor_precedes(cursor, other):
+        """Check whether a keyset cursor sorts before another one."""
+        def sort_key(value):
+            segment, (due_date, task_id) = _parse_cursor(value)
+            return segment, due_date or datetime.min, task_id
+        
+        return sort_key(cursor) < sort_key(other)
+    
+    @staticmethod
+    def count_tasks_before(cursor, **filters):
+        """
+        Count the tasks sorting before a keyset cursor.
+        
+        Args:
+            cursor: Keyset cursor of a task
+            **filters: Filters accepted by filter_tasks()
+        
+        Returns:
+            The number of matching tasks before the cursor in the task list
+        """
+        if task_store is not None and task_store.supports(filters):
+            return task_store.count_before(cursor, **filters)
+        stop, key = _parse_cursor(cursor)
+        query = TaskController.filter_tasks(read_session.query(func.count(Task.id)), **filters)
+        
+        count = 0
+        for index, completed, dated in _filtered_segments(filters, stop + 1):
+            segment = _task_segment(query, completed, dated, before=key if index == stop else None)
+            count += segment.scalar()
+        return count
+    
+    @staticmethod
+    def get_task_position(task_id, **filters):
+        """
+        Get the index of a task in the filtered task list.
+        
+        Args:
+            task_id: ID of the task
+            **filters: Filters accepted by filter_tasks()
+        
+        Returns:
+            The index of the task, None if it does not exist or is filtered out
+        """
+        if task_store is not None and task_store.supports(filters):
+            return task_store.position(task_id, **filters)
+        query = TaskController.filter_tasks(
+            read_session.query(Task).filter(Task.id == task_id),
+            **filters
+        )
+        task = query.first()
+        if not task:
+            return None
+        return TaskController.count_tasks_before(TaskController.get_task_cursor(task), **filters)
+    
+    @staticmethod
+    def search_tasks(terms, page=0, limit=TASK_PAGE_SIZE, **filters):
+        """
+        Search task titles and descriptions, best matches first.
+        
+        Uses the FTS5 index on SQLite. bm25 has to be computed for every
+        ranked match, so only the SEARCH_CANDIDATES newest matching tasks are
+        ranked, which keeps common words fast on large task lists; the pages
+        after them hold the older matches, newest first. Other databases use
+        a substring match ordered by ID.
+        
+        Args:
+            terms: Words to search for, every word has to match
+            page: Index of the page of results
+            limit: Maximum number of tasks in the page
+            **filters: Filters accepted by filter_tasks()
+        
+        Returns:
+            A (tasks, has_more) tuple, has_more tells whether later pages exist
+        """
+        match = _match_query(terms or "")
+        if match is None:
+            return [], False
+        
+        _sync_task_changes()
+        query = read_session.query(Task).options(joinedload(Task.category))
+        if engine.dialect.name != "sqlite":
+            pattern = f"%{terms.strip()}%"
+            query = TaskController.filter_tasks(
+                query.filter(or_(Task.title.ilike(pattern), Task.description.ilike(pattern))),
+                **filters
+            ).order_by(Task.id)
+            tasks = query.offset(page * limit).limit(limit + 1).all()
+            return tasks[:limit], len(tasks) > limit
+        
+        matches = TaskController.filter_tasks(
+            read_session.query(Task.id.label("id"), _tasks_fts.c.rank.label("rank"))
+            .join(_tasks_fts, _tasks_fts.c.rowid == Task.id)
+            .filter(_tasks_fts.c.tasks_fts.op("MATCH")(match)),
+            **filters
+        )
+        candidates = (
+            matches.order_by(_tasks_fts.c.rowid.desc())
+            .limit(SEARCH_CANDIDATES)
+            .subquery()
+        )
+        start = page * limit
+        tasks = (
+            query.join(candidates, candidates.c.id == Task.id)
+            .order_by(candidates.c.rank)
+            .offset(start).limit(limit + 1).all()
+        )
+        if len(tasks) > limit:
+            return tasks[:limit], True
+        
+        # The ranked matches ran out, continue with the older ones
+        ranked, oldest = read_session.query(func.count(), func.min(candidates.c.id)).one()
+        if ranked < SEARCH_CANDIDATES:
+            return tasks, False
+        older = matches.with_entities(Task.id).filter(Task.id < oldest).subquery()
+        tasks += (
+            query.join(older, older.c.id == Task.id)
+            .order_by(Task.id.desc())
+            .offset(max(0, start - ranked)).limit(limit + 1 - len(tasks)).all()
+        )
+        return tasks[:limit], len(tasks) > limit
     
     @staticmethod
     def get_task_by_id(task_id):
         """Get a task by ID."""
-        return Task.get_by_id(task_id)
+        _sync_task_changes()
+        if task_store is not None:
+            return task_store.get(task_id)
+        return (
+            read_session.query(Task).options(joinedload(Task.category))
+            .filter(Task.id == task_id)
+            .first()
+        )
+    
+    @staticmethod
+    def get_task_statistics():
+        """
+        Get task counts with one aggregate query.
+        
+        The overdue count comes from the due-date timeline.
+        
+        Returns:
+            A dict with the total, completed, pending and overdue task counts,
+            and the task count of each priority under "priorities"
+        """
+        if task_store is not None:
+            statistics = task_store.statistics()
+            statistics["overdue"] = _due_timeline.overdue_count()
+            return statistics
+        
+        rows = (
+            read_session.query(
+                Task.priority,
+                func.count(Task.id),
+                func.sum(case((Task.completed == True, 1), else_=0))
+            )
+            .group_by(Task.priority)
+            .all()
+        )
+        
+        statistics = {
+            "total": 0,
+            "completed": 0,
+            "overdue": _due_timeline.overdue_count(),
+            "priorities": {1: 0, 2: 0, 3: 0}
+        }
+        for priority, total, completed in rows:
+            statistics["total"] += total
+            statistics["completed"] += completed or 0
+            statistics["priorities"][priority] = total
+        statistics["pending"] = statistics["total"] - statistics["completed"]
+        return statistics
     
     @staticmethod
-    def create_task(title, description=None, due_date=None, priority=2, category_id=None):
-        """Create a new task."""
+    def get_overdue_count():
+        """Get the number of overdue tasks from the due-date timeline."""
+        return _due_timeline.overdue_count()
+    
+    @staticmethod
+    def get_next_overdue_time():
+        """Get when the next task becomes overdue, None if no pending task is due later."""
+        return _due_timeline.next_transition()
+    
+    @staticmethod
+    def create_task(title, description=None, due_date=None, priority=2, category_id=None,
+                    wait=True):
+        """Create a new task, wait=False returns a Future of it in write-behind mode."""
         # Convert due_date string to datetime object if provided
         due_date_obj = None
         if due_date:
@@ -27,23 +664,22 @@ class TaskController:
                 # Invalid date format
                 pass
         
-        task = Task(
-            title=title,
-            description=description,
-            due_date=due_date_obj,
-            priority=priority,
-            category_id=category_id
-        )
-        task.save(db_session)
-        return task
+        def apply():
+            task = Task(
+                title=title,
+                description=description,
+                due_date=due_date_obj,
+                priority=priority,
+                category_id=category_id
+            )
+            task.save(db_session, commit=False)
+            return task
+        
+        return _write(apply, lambda task: _notify_task_change(task.id), wait)
     
     @staticmethod
-    def update_task(task_id, **kwargs):
-        """Update a task."""
-        task = Task.get_by_id(task_id)
-        if not task:
-            return None
-        
+    def update_task(task_id, wait=True, **kwargs):
+        """Update a task, wait=False returns a Future of it in write-behind mode."""
         # Convert due_date string to datetime object if provided
         if 'due_date' in kwargs and kwargs['due_date']:
             try:
@@ -52,72 +688,267 @@ class TaskController:
                 # Invalid date format
                 del kwargs['due_date']
         
-        for key, value in kwargs.items():
-            if hasattr(task, key):
-                setattr(task, key, value)
+        def apply():
+            task = Task.get_by_id(task_id)
+            if not task:
+                return None
+            
+            for key, value in kwargs.items():
+                if hasattr(task, key):
+                    setattr(task, key, value)
+            
+            task.save(db_session, commit=False)
+            return task
         
-        task.save(db_session)
-        return task
+        return _write(apply, lambda task: _notify_task_change(task_id), wait)
     
     @staticmethod
-    def delete_task(task_id):
-        """Delete a task."""
-        task = Task.get_by_id(task_id)
-        if task:
-            task.delete(db_session)
-            return True
-        return False
+    def delete_task(task_id, wait=True):
+        """Delete a task, wait=False returns a Future of the result in write-behind mode."""
+        def apply():
+            task = Task.get_by_id(task_id)
+            if task:
+                task.delete(db_session, commit=False)
+                return True
+            return False
+        
+        return _write(apply, lambda deleted: _notify_task_change(task_id), wait)
     
     @staticmethod
-    def toggle_task_completion(task_id):
-        """Toggle task completion status."""
-        task = Task.get_by_id(task_id)
-        if task:
-            task.completed = not task.completed
-            task.save(db_session)
-            return task
-        return None
+    def _bulk_execute(statement, task_ids=None, wait=True, **filters):
+        """
+        Run a set-based UPDATE or DELETE on the selected tasks and commit once.
+        
+        Args:
+            statement: update(Task) or delete(Task) statement
+            task_ids: IDs of the tasks to change, None for every task matching the filters
+            wait: Wait for the commit, otherwise return a Future of the result
+            **filters: Filters accepted by filter_tasks()
+        
+        Returns:
+            The IDs of the changed tasks
+        """
+        statement = TaskController.filter_tasks(statement, **filters)
+        statement = statement.returning(Task.id).execution_options(synchronize_session=False)
+        if task_ids is not None:
+            task_ids = list(task_ids)
+        
+        def apply():
+            if task_ids is None:
+                return db_session.execute(statement).scalars().all()
+            
+            changed = []
+            for start in range(0, len(task_ids), _BULK_ID_CHUNK):
+                chunk = task_ids[start:start + _BULK_ID_CHUNK]
+                changed.extend(
+                    db_session.execute(statement.where(Task.id.in_(chunk))).scalars()
+                )
+            return changed
+        
+        return _write(apply, _notify_task_changes, wait)
+    
+    @staticmethod
+    def bulk_update_tasks(values, task_ids=None, wait=True, **filters):
+        """
+        Update many tasks with a single UPDATE ... WHERE statement.
+        
+        Args:
+            values: Dict of the columns to set, among completed, priority,
+                category_id and due_date
+            task_ids: IDs of the tasks to update, None for every task matching the filters
+            wait: Wait for the commit, otherwise return a Future of the result
+            **filters: Filters accepted by filter_tasks()
+        
+        Returns:
+            The IDs of the updated tasks
+        """
+        unknown = set(values) - set(_BULK_UPDATE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot bulk update {', '.join(sorted(unknown))}")
+        
+        # Rendered task items are cached on updated_at
+        values = dict(values, updated_at=func.now())
+        return TaskController._bulk_execute(update(Task).values(values), task_ids, wait, **filters)
+    
+    @staticmethod
+    def bulk_delete_tasks(task_ids=None, wait=True, **filters):
+        """
+        Delete many tasks with a single DELETE ... WHERE statement.
+        
+        Args:
+            task_ids: IDs of the tasks to delete, None for every task matching the filters
+            wait: Wait for the commit, otherwise return a Future of the result
+            **filters: Filters accepted by filter_tasks()
+        
+        Returns:
+            The IDs of the deleted tasks
+        """
+        return TaskController._bulk_execute(delete(Task), task_ids, wait, **filters)
+    
+    @staticmethod
+    def bulk_create_tasks(rows, wait=True):
+        """
+        Insert a batch of tasks with a single executemany statement.
+        
+        Category names are resolved to IDs once for the whole batch, missing
+        categories are created with the default color.
+        
+        Args:
+            rows: List of dicts with the title, description, due_date (datetime),
+                priority, completed and category (name) of each task
+            wait: Wait for the commit, otherwise return a Future of the result
+        
+        Returns:
+            The IDs of the inserted tasks
+        """
+        names = {row["category"] for row in rows if row.get("category")}
+        
+        def apply():
+            if not rows:
+                return []
+            
+            category_ids = {}
+            if names:
+                category_ids = dict(
+                    db_session.query(Category.name, Category.id).filter(Category.name.in_(names))
+                )
+                missing = [{"name": name} for name in names if name not in category_ids]
+                if missing:
+                    created = db_session.execute(
+                        insert(Category).returning(Category.name, Category.id),
+                        missing
+                    )
+                    category_ids.update(created.all())
+            
+            # A Core insert keeps None values, the ORM bulk insert would split the
+            # batch into one statement per distinct set of non-None columns
+            result = db_session.execute(
+                insert(Task.__table__).returning(Task.__table__.c.id),
+                [
+                    {
+                        "title": row["title"],
+                        "description": row.get("description"),
+                        "due_date": row.get("due_date"),
+                        "priority": row.get("priority") or 2,
+                        "completed": bool(row.get("completed")),
+                        "category_id": category_ids.get(row.get("category"))
+                    }
+                    for row in rows
+                ]
+            )
+            return result.scalars().all()
+        
+        def after_commit(task_ids):
+            if names:
+                _category_catalog.invalidate()
+            _notify_task_changes(task_ids)
+        
+        return _write(apply, after_commit, wait)
+    
+    @staticmethod
+    def iter_task_rows(batch_size=1000):
+        """
+        Iterate over every task without loading the whole table.
+        
+        Rows are fetched batch_size at a time with yield_per() and hold plain
+        column values, the category is given by name.
+        
+        Args:
+            batch_size: Number of rows fetched from the database at once
+        
+        Returns:
+            An iterator of rows ordered by task ID
+        """
+        query = (
+            read_session.query(
+                Task.id,
+                Task.title,
+                Task.description,
+                Task.due_date,
+                Task.priority,
+                Task.completed,
+                Category.name.label("category"),
+                Task.created_at,
+                Task.updated_at
+            )
+            .outerjoin(Task.category)
+            .order_by(Task.id)
+        )
+        return query.yield_per(batch_size)
+    
+    @staticmethod
+    def toggle_task_completion(task_id, wait=True):
+        """Toggle task completion status, wait=False returns a Future in write-behind mode."""
+        def apply():
+            task = Task.get_by_id(task_id)
+            if task:
+                task.completed = not task.completed
+                task.save(db_session, commit=False)
+                return task
+            return None
+        
+        return _write(apply, lambda task: _notify_task_change(task_id), wait)
 
 
 class CategoryController:
     """Controller for category operations."""
     
+    @staticmethod
+    def get_version():
+        """Get a counter that changes whenever a category is changed."""
+        _category_catalog.rows()
+        return _category_catalog.version
+    
     @staticmethod
     def get_all_categories():
-        """Get all categories."""
-        return Category.query.order_by(Category.name).all()
+        """Get all categories as CategoryRow tuples, served from the catalog cache."""
+        return list(_category_catalog.rows())
     
     @staticmethod
     def get_category_by_id(category_id):
         """Get a category by ID."""
-        return Category.get_by_id(category_id)
+        return read_session.query(Category).filter(Category.id == category_id).first()
     
     @staticmethod
-    def create_category(name, color="#007BFF"):
-        """Create a new category."""
-        category = Category(name=name, color=color)
-        category.save(db_session)
-        return category
+    def create_category(name, color="#007BFF", wait=True):
+        """Create a new category, wait=False returns a Future of it in write-behind mode."""
+        def apply():
+            category = Category(name=name, color=color)
+            category.save(db_session, commit=False)
+            return category
+        
+        return _write(apply, lambda category: _category_catalog.invalidate(), wait)
     
     @staticmethod
-    def update_category(category_id, **kwargs):
-        """Update a category."""
-        category = Category.get_by_id(category_id)
-        if not category:
-            return None
-        
-        for key, value in kwargs.items():
-            if hasattr(category, key):
-                setattr(category, key, value)
+    def update_category(category_id, wait=True, **kwargs):
+        """Update a category, wait=False returns a Future of it in write-behind mode."""
+        def apply():
+            category = Category.get_by_id(category_id)
+            if not category:
+                return None
+            
+            for key, value in kwargs.items():
+                if hasattr(category, key):
+                    setattr(category, key, value)
+            
+            category.save(db_session, commit=False)
+            return category
         
-        category.save(db_session)
-        return category
+        return _write(apply, lambda category: _category_catalog.invalidate(), wait)
     
     @staticmethod
-    def delete_category(category_id):
-        """Delete a category."""
-        category = Category.get_by_id(category_id)
-        if category:
-            category.delete(db_session)
-            return True
-        return False
+    def delete_category(category_id, wait=True):
+        """Delete a category, wait=False returns a Future of the result in write-behind mode."""
+        def apply():
+            category = Category.get_by_id(category_id)
+            if category:
+                category.delete(db_session, commit=False)
+                return True
+            return False
+        
+        def after_commit(deleted):
+            _category_catalog.invalidate()
+            # The tasks of the category were deleted with it
+            _notify_task_change(None)
+        
+        return _write(apply, after_commit, wait)
@@ -0,0 +1,185 @@
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+
+from config import BULK_BATCH_SIZE
+from controllers.todo_controller import TaskController
+
+# Columns of an exported task, imports read the same columns and ignore
+# id, created_at and updated_at
+TASK_COLUMNS = [
+    "id", "title", "description", "due_date", "priority", "completed",
+    "category", "created_at", "updated_at"
+]
+
+FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+class TaskImportError(ValueError):
+    """An import stopped at invalid input, the batches before it stay imported."""
+    
+    def __init__(self, message, imported):
+        super().__init__(message)
+        self.imported = imported
+
+
+def _jsonl_records(stream):
+    """Parse the JSON object on each non-empty line of a stream."""
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            raise ValueError(f"Line {number} is not valid JSON: {error}") from error
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {number} is not a JSON object")
+        yield record
+
+
+def _text_field(record, name, number):
+    """Get a text field of a record, None if it is missing."""
+    value = record.get(name)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"Record {number}: {name} must be a string")
+    return value
+
+
+def _parse_date(value):
+    """Parse an ISO date or datetime, None if it is empty or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # Invalid date format
+        return None
+
+
+def _parse_bool(value):
+    """Parse a boolean from JSON or from CSV text."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def _parse_priority(value):
+    """Parse a priority, Medium if it is empty or invalid."""
+    try:
+        priority = int(value)
+    except (TypeError, ValueError):
+        return 2
+    return priority if priority in (1, 2, 3) else 2
+
+
+class TransferController:
+    """Controller for bulk import and export of tasks."""
+    
+    @staticmethod
+    def read_tasks(stream, file_format="csv"):
+        """
+        Parse tasks from a text stream one record at a time.
+        
+        Args:
+            stream: Text stream holding CSV with a header row, or JSON Lines
+            file_format: "csv" or "jsonl"
+        
+        Returns:
+            An iterator of task dicts accepted by TaskController.bulk_create_tasks(),
+            records without a title are skipped
+        
+        Raises:
+            ValueError: When a JSON Lines record is not a JSON object or has a
+                title, description, due_date or category that is not a string,
+                or when the stream cannot be decoded
+        """
+        if file_format == "csv":
+            records = csv.DictReader(stream)
+        elif file_format == "jsonl":
+            records = _jsonl_records(stream)
+        else:
+            raise ValueError(f"Unsupported format: {file_format}")
+        
+        for number, record in enumerate(records, 1):
+            title = (_text_field(record, "title", number) or "").strip()
+            if not title:
+                continue
+            yield {
+                "title": title,
+                "description": _text_field(record, "description", number) or None,
+                "due_date": _parse_date(_text_field(record, "due_date", number)),
+                "priority": _parse_priority(record.get("priority")),
+                "completed": _parse_bool(record.get("completed")),
+                "category": (_text_field(record, "category", number) or "").strip() or None
+            }
+    
+    @staticmethod
+    def import_tasks(stream, file_format="csv", batch_size=BULK_BATCH_SIZE):
+        """
+        Import tasks from a text stream in batches.
+        
+        Each batch is inserted with one executemany statement and committed,
+        so memory use does not grow with the size of the file.
+        
+        Args:
+            stream: Text stream holding CSV with a header row, or JSON Lines
+            file_format: "csv" or "jsonl"
+            batch_size: Number of tasks inserted per statement
+        
+        Returns:
+            The number of imported tasks
+        
+        Raises:
+            TaskImportError: When the input is invalid, with the number of
+                tasks imported by the batches committed before
+        """
+        tasks = TransferController.read_tasks(stream, file_format)
+        imported = 0
+        try:
+            while True:
+                batch = list(islice(tasks, batch_size))
+                if not batch:
+                    return imported
+                imported += len(TaskController.bulk_create_tasks(batch))
+        except (ValueError, csv.Error) as error:
+            raise TaskImportError(str(error), imported) from error
+    
+    @staticmethod
+    def export_tasks(file_format="csv", batch_size=BULK_BATCH_SIZE):
+        """
+        Export every task as chunks of text.
+        
+        Args:
+            file_format: "csv" or "jsonl"
+            batch_size: Number of tasks per chunk
+        
+        Returns:
+            An iterator of text chunks, CSV starts with a header row
+        """
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported format: {file_format}")
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if file_format == "csv":
+            writer.writerow(TASK_COLUMNS)
+        
+        for count, row in enumerate(TaskController.iter_task_rows(batch_size), 1):
+            values = [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ]
+            if file_format == "csv":
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(TASK_COLUMNS, values))) + "\n")
+            
+            if count % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
@@ -1,3 +1,10 @@
-from database.db import db_session, init_db, shutdown_db, Base, engine
+from database.db import (
+    db_session, read_session, init_db, ensure_db, shutdown_db, Base, engine, read_engine,
+    begin_query_scope, end_query_scope, data_revision, data_version, add_statement_listener
+)
 
-__all__ = ['db_session', 'init_db', 'shutdown_db', 'Base', 'engine']
+__all__ = [
+    'db_session', 'read_session', 'init_db', 'ensure_db', 'shutdown_db', 'Base', 'engine',
+    'read_engine', 'begin_query_scope', 'end_query_scope', 'data_revision',
+    'data_version', 'add_statement_listener'
+]
@@ -1,35 +1,797 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool
+from collections import Counter, deque
+from contextlib import contextmanager
+from urllib.parse import quote
 
+import logging
+import sqlite3
+import threading
+import time
 import sys
 import os
 
+try:
+    import fcntl
+except ImportError:
+    # Windows, where databases are initialized without the file lock
+    fcntl = None
+
 # Add the parent directory to the path so we can import from the root
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, _ROOT)
+
+from config import (
+    SQLALCHEMY_DATABASE_URI, N_PLUS_ONE_THRESHOLD, SQLITE_PROFILE, SQLITE_PRAGMAS,
+    SQLITE_POOL, SQLITE_POOL_SIZE, SQLITE_READ_ONLY_ENGINE, SQLITE_READ_POOL_SIZE, SLOW_QUERY_MS,
+    SLOW_QUERY_LOG_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+
+def create_db_engine(url=SQLALCHEMY_DATABASE_URI, profile=SQLITE_PROFILE, pool=SQLITE_POOL):
+    """
+    Create an engine, tuned for concurrent use when it points at a SQLite file.
+    
+    Args:
+        url: Database URL
+        profile: 'production' to apply SQLITE_PRAGMAS on connect, 'default'
+            to keep SQLite's own settings
+        pool: 'queue' to share a pool of connections between threads, 'null'
+            to open a connection per checkout (multi-process servers)
+    
+    Returns:
+        A SQLAlchemy engine
+    """
+    url = make_url(url)
+    if _sqlite_file(url) is None:
+        return create_engine(url, echo=False)
+    
+    if pool == "null":
+        engine = create_engine(url, echo=False, poolclass=NullPool)
+    else:
+        engine = create_engine(url, echo=False, pool_size=SQLITE_POOL_SIZE)
+    
+    if profile == "production":
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            """Configure every new SQLite connection."""
+            cursor = dbapi_connection.cursor()
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            cursor.close()
+    return engine
+
+
+# Pragmas that write to the database file, read-only connections skip them
+_WRITE_PRAGMAS = ("journal_mode", "synchronous")
+
+
+def create_read_engine(url=SQLALCHEMY_DATABASE_URI, profile=SQLITE_PROFILE, pool=SQLITE_POOL):
+    """
+    Create a read-only engine on a SQLite file.
+    
+    Connections open the file with mode=ro and set query_only, so they never
+    take the write lock: in WAL mode they read concurrently with each other
+    and with the writer. The file has to exist before the first connection.
+    
+    Args:
+        url: Database URL
+        profile: 'production' to apply the SQLITE_PRAGMAS that do not write
+            on connect, 'default' to keep SQLite's own settings
+        pool: 'queue' to share a pool of connections between threads, 'null'
+            to open a connection per checkout (multi-process servers)
+    
+    Returns:
+        A SQLAlchemy engine, None for databases other than SQLite files
+    """
+    url = make_url(url)
+    path = _sqlite_file(url)
+    if path is None:
+        return None
+    
+    url = url.set(
+        database=f"file:{quote(os.path.abspath(path))}",
+        query={"mode": "ro", "uri": "true"}
+    )
+    if pool == "null":
+        read_engine = create_engine(url, echo=False, poolclass=NullPool)
+    else:
+        read_engine = create_engine(url, echo=False, pool_size=SQLITE_READ_POOL_SIZE)
+    
+    @event.listens_for(read_engine, "connect")
+    def _apply_read_pragmas(dbapi_connection, connection_record):
+        """Configure every new read-only connection."""
+        cursor = dbapi_connection.cursor()
+        if profile == "production":
+            for name, value in SQLITE_PRAGMAS.items():
+                if name not in _WRITE_PRAGMAS:
+                    cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+    return read_engine
+
+
+def _sqlite_file(url):
+    """Return the database file of a SQLite URL, None for other databases."""
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database
 
-from config import SQLALCHEMY_DATABASE_URI
 
 # Create engine
-engine = create_engine(SQLALCHEMY_DATABASE_URI, echo=False)
+engine = create_db_engine()
 
 # Create session factory
-db_session = scoped_session(
-    sessionmaker(autocommit=False, autoflush=False, bind=engine)
-)
+session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+db_session = scoped_session(session_factory)
+
+# Engine and sessions of the controller reads, the read-write ones when the
+# database is not a SQLite file or the split is turned off
+read_engine = (create_read_engine() if SQLITE_READ_ONLY_ENGINE else None) or engine
+if read_engine is engine:
+    read_session = db_session
+else:
+    read_session = scoped_session(
+        sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    )
 
 # Base class for all models
 Base = declarative_base()
 Base.query = db_session.query_property()
 
+# Query scope of the current thread, set while a callback is running
+_query_scope = threading.local()
+
+
+class QueryScope(object):
+    """Statements executed on the engine while a scope is active."""
+    
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.statements = Counter()
+    
+    def repeated_statements(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """Return the statements issued at least threshold times."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    """Record a statement against the active query scope, if any."""
+    scope = getattr(_query_scope, "current", None)
+    if scope is not None:
+        scope.count += 1
+        scope.statements[statement] += 1
+
+
+def begin_query_scope(name):
+    """Start counting the statements issued by the current thread."""
+    _query_scope.current = QueryScope(name)
+    return _query_scope.current
+
+
+def end_query_scope():
+    """
+    Stop counting statements and warn about N+1 query patterns.
+    
+    Lazy loads issue the same SQL with different parameters, so a statement
+    repeated within one scope usually means a relationship should be eagerly
+    loaded.
+    
+    Returns:
+        The finished QueryScope, or None if no scope was active
+    """
+    scope = getattr(_query_scope, "current", None)
+    _query_scope.current = None
+    if scope is None:
+        return None
+    
+    logger.debug("%s issued %d queries", scope.name, scope.count)
+    for statement, count in scope.repeated_statements():
+        logger.warning(
+            "Possible N+1 query in %s: statement issued %d times: %s",
+            scope.name, count, " ".join(statement.split())
+        )
+    return scope
+
+
+class SlowQueryLog(object):
+    """
+    Log statements slower than a threshold, with their query plan.
+    
+    The most recent slow queries are kept in a bounded ring buffer for the
+    debug route of the app.
+    """
+    
+    def __init__(self, threshold_ms=SLOW_QUERY_MS, size=SLOW_QUERY_LOG_SIZE):
+        self.threshold = threshold_ms / 1000.0
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+    
+    def record(self, cursor, statement, parameters, executemany, elapsed):
+        """
+        Log a statement that took longer than the threshold.
+        
+        Args:
+            cursor: DB-API cursor the statement ran on
+            statement: SQL statement
+            parameters: Statement parameters
+            executemany: Whether the statement ran once per parameter set
+            elapsed: Duration of the statement in seconds
+        """
+        plan = None
+        if not executemany and engine.dialect.name == "sqlite":
+            plan = _query_plan(cursor, statement, parameters)
+        entry = {
+            "time": time.time(),
+            "duration_ms": round(elapsed * 1000, 1),
+            "statement": " ".join(statement.split()),
+            "parameters": repr(parameters)[:500],
+            "caller": _controller_caller(),
+            "plan": plan,
+            "warnings": _plan_warnings(plan or [])
+        }
+        with self._lock:
+            self._entries.append(entry)
+        
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s %s%s",
+            entry["duration_ms"], entry["caller"], entry["statement"], entry["parameters"],
+            "".join(f"\n    {line}" for line in plan or [])
+        )
+    
+    def entries(self):
+        """Return the recorded slow queries, most recent first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+
+def _query_plan(cursor, statement, parameters):
+    """
+    Return SQLite's EXPLAIN QUERY PLAN of a statement as indented lines.
+    
+    The plan is read on the DB-API connection of the statement, bypassing the
+    engine events, so explaining does not count as a statement itself.
+    """
+    try:
+        rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    except sqlite3.Error:
+        return None
+    
+    depths = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        lines.append("  " * depths[node_id] + detail)
+    return lines
+
+
+def _plan_warnings(plan):
+    """Return the steps of a query plan that read whole tables or sort in temporary B-trees."""
+    return [
+        line.strip() for line in plan
+        if (line.strip().startswith("SCAN ") and "VIRTUAL TABLE" not in line)
+        or "TEMP B-TREE" in line
+    ]
+
+
+def _controller_caller():
+    """Return the controller method, or else the outermost app frame, that issued a statement."""
+    frame = sys._getframe(2)
+    fallback = "unknown"
+    while frame is not None:
+        code = frame.f_code
+        path = os.path.relpath(code.co_filename, _ROOT)
+        if not path.startswith(".."):
+            name = f"{getattr(code, 'co_qualname', code.co_name)} ({path}:{frame.f_lineno})"
+            if path.startswith("controllers"):
+                return name
+            if not path.startswith("database"):
+                fallback = name
+        frame = frame.f_back
+    return fallback
+
+
+# Slow queries of this process, None when SLOW_QUERY_MS is 0
+slow_query_log = SlowQueryLog() if SLOW_QUERY_MS > 0 else None
+
+# Functions called with (cursor, statement, parameters, executemany, elapsed)
+# after every statement executed on the engines
+_statement_listeners = []
+
+
+def add_statement_listener(listener):
+    """Call listener with the duration in seconds of every statement, once per listener."""
+    if listener not in _statement_listeners:
+        _statement_listeners.append(listener)
+    return listener
+
+
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    """Remember when a statement started, statements can nest on a connection."""
+    if _statement_listeners:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+
+def _end_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    """Pass the duration of a finished statement to the statement listeners."""
+    started = conn.info.get("statement_started")
+    # Listeners added while the statement ran have no start time for it
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    for listener in _statement_listeners:
+        listener(cursor, statement, parameters, executemany, elapsed)
+
+
+def _forget_statement_timer(context):
+    """Drop the timer of a failed statement, after_cursor_execute never runs for it."""
+    started = context.connection.info.get("statement_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def _log_slow_statement(cursor, statement, parameters, executemany, elapsed):
+    """Record the statement in the slow query log if it was slow."""
+    if elapsed >= slow_query_log.threshold:
+        slow_query_log.record(cursor, statement, parameters, executemany, elapsed)
+
+
+if slow_query_log is not None:
+    add_statement_listener(_log_slow_statement)
+
+# Statements of both engines are counted and timed the same way
+for _target in {engine, read_engine}:
+    for _identifier, _listener in (
+        ("before_cursor_execute", _count_statement),
+        ("before_cursor_execute", _start_statement_timer),
+        ("after_cursor_execute", _end_statement_timer),
+        ("handle_error", _forget_statement_timer),
+    ):
+        event.listen(_target, _identifier, _listener)
+
+
+class DataVersion(object):
+    """
+    Watch SQLite's data_version from a dedicated connection.
+    
+    PRAGMA data_version changes whenever another connection commits to the
+    database file, including connections in other processes. The watching
+    connection never writes, so every commit made elsewhere is observed.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._version = None
+        self._revision = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self):
+        """Return the watching connection, opening it on first use."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        return self._connection
+    
+    def get(self):
+        """Return the current data_version of the database file."""
+        with self._lock:
+            return self._connect().execute("PRAGMA data_version").fetchone()[0]
+    
+    def revision(self):
+        """
+        Return the revision counter stored in the database (see REVISION_DDL).
+        
+        The counter is the same for every process, it is only read again
+        after data_version shows a commit.
+        """
+        with self._lock:
+            connection = self._connect()
+            version = connection.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._version:
+                try:
+                    self._revision = connection.execute(
+                        "SELECT revision FROM data_revision"
+                    ).fetchone()[0]
+                except sqlite3.OperationalError:
+                    # Not created yet, read it again on the next call
+                    return 0
+                self._version = version
+            return self._revision
+    
+    def reset(self):
+        """Forget the connection inherited from a parent process, without closing it."""
+        self._connection = None
+        self._version = None
+        self._lock = threading.Lock()
+
+
+# Commits that wrote through db_session in this process
+_commit_count = 0
+_commit_changed = threading.Condition()
+
+_sqlite_path = _sqlite_file(engine.url)
+_data_version = DataVersion(_sqlite_path) if _sqlite_path else None
+
+
+@event.listens_for(session_factory, "after_flush")
+def _mark_flush(session, flush_context):
+    """Remember that the transaction of a session wrote rows."""
+    # Attributes set to their current value leave the row unchanged
+    if session.new or session.deleted or any(session.is_modified(row) for row in session.dirty):
+        session.info["wrote"] = True
+
+
+@event.listens_for(session_factory, "do_orm_execute")
+def _mark_statement(orm_execute_state):
+    """Remember that the transaction of a session ran a bulk statement."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(session_factory, "after_rollback")
+def _forget_writes(session):
+    """Forget the writes of a rolled back transaction."""
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(session_factory, "after_commit")
+def _count_commit(session):
+    """Wake the threads waiting for a change after every commit that wrote."""
+    global _commit_count
+    if not session.info.pop("wrote", False):
+        return
+    with _commit_changed:
+        _commit_count += 1
+        _commit_changed.notify_all()
+
+
+def data_version():
+    """Return SQLite's data_version of the database file, None for other databases."""
+    return _data_version.get() if _data_version is not None else None
+
+
+def data_revision():
+    """
+    Return a token that changes whenever the data in the database changes.
+    
+    On SQLite the token is the revision counter bumped by triggers on every
+    task and category row written, so every process and server worker
+    reports the same token for the same data. Other databases fall back to
+    the writing commits of this process. Comparing tokens is much cheaper
+    than re-reading and re-rendering data.
+    """
+    if _data_version is None:
+        return str(_commit_count)
+    return str(_data_version.revision())
+
+
+def wait_for_change(revision, timeout, check_interval=1.0):
+    """
+    Wait until the data changes.
+    
+    Commits made by this process wake the waiting threads right away, commits
+    made by other processes are noticed within check_interval seconds.
+    
+    Args:
+        revision: Token returned by data_revision() before waiting
+        timeout: Maximum number of seconds to wait
+        check_interval: Seconds between checks of data_version
+    
+    Returns:
+        The current data_revision(), equal to revision on timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        with _commit_changed:
+            commits = _commit_count
+            current = data_revision()
+            remaining = deadline - time.monotonic()
+            if current != revision or remaining <= 0:
+                return current
+            _commit_changed.wait_for(lambda: _commit_count != commits,
+                                     min(remaining, check_interval))
+
+
+@contextmanager
+def _init_lock():
+    """
+    Hold an exclusive lock on <database>.init.lock while the schema is created.
+    
+    Server workers start in parallel and would otherwise both find a table
+    missing, and one of them fail to create it.
+    """
+    if _sqlite_path is None or fcntl is None:
+        yield
+        return
+    try:
+        lock_file = open(_sqlite_path + ".init.lock", "a")
+    except OSError:
+        # Read-only directory, no process can create the schema there
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
 def init_db():
-    """Initialize the database and create all tables."""
+    """Initialize the database and create all tables, one process at a time."""
     # Import all models to ensure they are registered with Base
     from models.todo import Task, Category
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    with _init_lock():
+        # Create all tables
+        Base.metadata.create_all(bind=engine)
+        upgrade_db()
+        create_search_index()
+        create_change_log()
+
+
+_db_ready = False
+_db_ready_lock = threading.Lock()
+
+
+def ensure_db():
+    """
+    Initialize the database once per process, on first use.
+    
+    The app calls this before handling its first request instead of at
+    import, so importing it, or forking workers from it, does not touch the
+    database.
+    """
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_ready_lock:
+        if not _db_ready:
+            init_db()
+            _db_ready = True
+
+
+def upgrade_db():
+    """
+    Create the indexes missing from an existing database.
+    
+    create_all() skips tables that already exist, so indexes declared on a
+    model after its table was created have to be added here.
+    
+    Returns:
+        The names of the indexes that were created
+    """
+    inspector = inspect(engine)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    
+    # Refresh the planner statistics so the new indexes get picked
+    if created and engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+    return created
+
+
+# FTS5 index of the task titles and descriptions. It is an external content
+# table reading the text from tasks, the triggers keep it in sync with every
+# change, including bulk statements that bypass the ORM. Prefixes of 2 and 3
+# characters are indexed too, so short search-as-you-type prefixes do not
+# expand into thousands of terms.
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # Index the tasks that existed before the search index
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+
+
+def create_search_index():
+    """
+    Create and backfill the full-text search index of the tasks, if missing.
+    
+    Returns:
+        True if the index was created, False if it existed or the database
+        is not SQLite
+    """
+    if engine.dialect.name != "sqlite" or inspect(engine).has_table("tasks_fts"):
+        return False
+    
+    with engine.begin() as connection:
+        for statement in SEARCH_INDEX_DDL:
+            connection.exec_driver_sql(statement)
+    return True
+
+
+# Number of task changes kept in the change log
+CHANGE_LOG_SIZE = 10000
+
+# Log of the IDs of changed and deleted tasks, read by every process to
+# invalidate what it cached about them. The triggers also catch bulk
+# statements, and drop the entries that fell out of the log.
+CHANGE_LOG_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS task_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER NOT NULL
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_changes_update AFTER UPDATE ON tasks BEGIN
+        INSERT INTO task_changes(task_id) VALUES (old.id);
+        DELETE FROM task_changes WHERE id <= last_insert_rowid() - {CHANGE_LOG_SIZE};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_changes_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO task_changes(task_id) VALUES (old.id);
+        DELETE FROM task_changes WHERE id <= last_insert_rowid() - {CHANGE_LOG_SIZE};
+    END
+    """,
+]
+
+
+# Revision counter of the data, shared by every process through the database
+# file and read by data_revision(). Every task and category row written bumps
+# it, commits that write nothing leave it alone.
+REVISION_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS data_revision (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        revision INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO data_revision (id, revision) VALUES (1, 0)",
+] + [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS data_revision_{table}_{operation.lower()}
+    AFTER {operation} ON {table} BEGIN
+        UPDATE data_revision SET revision = revision + 1;
+    END
+    """
+    for table in ("tasks", "categories")
+    for operation in ("INSERT", "UPDATE", "DELETE")
+]
+
+
+def create_change_log():
+    """
+    Create the task change log and the revision counter, if missing.
+    
+    Returns:
+        True if the log exists, False if the database is not SQLite
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    
+    with engine.begin() as connection:
+        for statement in CHANGE_LOG_DDL + REVISION_DDL:
+            connection.exec_driver_sql(statement)
+    return True
+
+
+class ChangeFeed(object):
+    """
+    Follow the task change log, including changes made by other processes.
+    
+    The log is only read when data_version shows that something committed
+    since the last poll, so polling an idle database costs one PRAGMA.
+    """
+    
+    def __init__(self):
+        self._last_id = None
+        self._version = None
+        self._lock = threading.Lock()
+    
+    def poll(self):
+        """
+        Return the IDs of the tasks changed since the last poll.
+        
+        Returns:
+            A set of task IDs, or None when the log no longer holds every
+            change since the last poll and any task may have changed
+        """
+        with self._lock:
+            version = data_version()
+            if version is None or version == self._version:
+                return set()
+            self._version = version
+            
+            with engine.connect() as connection:
+                if self._last_id is None:
+                    # Changes made before the first poll were never cached
+                    self._last_id = connection.exec_driver_sql(
+                        "SELECT COALESCE(MAX(id), 0) FROM task_changes"
+                    ).scalar()
+                    return set()
+                
+                rows = connection.exec_driver_sql(
+                    "SELECT id, task_id FROM task_changes WHERE id > ? ORDER BY id",
+                    (self._last_id,)
+                ).all()
+            if not rows:
+                return set()
+            
+            # A gap after the last seen change means it was dropped from the log
+            missed = rows[0][0] > self._last_id + 1
+            self._last_id = rows[-1][0]
+            return None if missed else {row[1] for row in rows}
+    
+    def reset(self):
+        """Forget the lock inherited from a parent process."""
+        self._lock = threading.Lock()
+
+
+# Feed of task changes shared by the caches of this process
+task_changes = ChangeFeed()
+
+
+def _reset_after_fork():
+    """
+    Drop the database state inherited from a parent process.
+    
+    Preloading servers such as gunicorn fork their workers after importing
+    the app. SQLite connections must not be shared across processes, so the
+    child discards the inherited ones without closing them, which would
+    disturb the parent, and opens its own on demand.
+    """
+    global _commit_changed
+    engine.dispose(close=False)
+    db_session.registry.clear()
+    if read_engine is not engine:
+        read_engine.dispose(close=False)
+        read_session.registry.clear()
+    _commit_changed = threading.Condition()
+    if _data_version is not None:
+        _data_version.reset()
+    task_changes.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 def shutdown_db():
-    """Close the database session."""
+    """Close the database sessions."""
     db_session.remove()
+    read_session.remove()
@@ -0,0 +1,300 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+import os
+import threading
+
+from sqlalchemy import select
+
+from config import TASK_PAGE_SIZE, TASK_STORE
+from database.db import ChangeFeed, data_version, engine, read_engine, _sqlite_file
+from models.todo import Task, Category, CategoryRow, TaskStatus
+
+# Task columns held by the store
+TASK_ROW_COLUMNS = (
+    "id", "title", "description", "due_date", "priority", "completed", "category_id",
+    "created_at", "updated_at"
+)
+
+# Task IDs bound per IN (...) clause when rows are read again
+_REFRESH_CHUNK = 500
+
+
+class TaskRow(TaskStatus):
+    """Read-only copy of a task row, rendered like a Task."""
+    
+    __slots__ = TASK_ROW_COLUMNS + ("_categories",)
+    
+    def __init__(self, values, categories):
+        for name, value in zip(TASK_ROW_COLUMNS, values):
+            setattr(self, name, value)
+        self._categories = categories
+    
+    @property
+    def category(self):
+        """Return the CategoryRow of the task, None if it has none."""
+        return self._categories.get(self.category_id)
+    
+    def __repr__(self):
+        return f"<TaskRow {self.title}>"
+
+
+def _order_key(completed, due_date, task_id):
+    """Return the position of a task in the task list order, undated tasks first."""
+    return bool(completed), due_date is not None, due_date or datetime.min, task_id
+
+
+def _row_key(row):
+    """Return the order key of a TaskRow."""
+    return _order_key(row.completed, row.due_date, row.id)
+
+
+def _cursor_key(cursor):
+    """Return the order key of a keyset cursor."""
+    completed, due_date, task_id = cursor
+    return _order_key(completed, datetime.fromisoformat(due_date) if due_date else None, task_id)
+
+
+class TaskStore(object):
+    """
+    In-memory copy of the tasks with sorted indexes.
+    
+    Rows are kept in lists of order keys sorted like the task list, one over
+    all tasks and one per category and per priority, so pages, positions and
+    counts are bisections instead of queries. Mutations commit to SQLite
+    first, the store follows the database: when SQLite's data_version moved,
+    the next read re-reads the tasks named in the change log plus any new
+    ones, which covers writes made by this process and by other processes
+    alike. The whole table is only loaded again when the log missed changes.
+    """
+    
+    def __init__(self):
+        self.loads = 0
+        self._rows = {}
+        self._order = []
+        self._by_category = {}
+        self._by_priority = {}
+        self._categories = {}
+        self._max_id = 0
+        self._version = None
+        self._loaded = False
+        self._changes = ChangeFeed()
+        self._lock = threading.RLock()
+    
+    @staticmethod
+    def supports(filters):
+        """Check whether the store can answer a query with these filter_tasks() filters."""
+        if filters.get("due_after") or filters.get("due_before"):
+            return False
+        return not (filters.get("category_id") and filters.get("priority"))
+    
+    def sync(self):
+        """Bring the rows up to date with the database."""
+        with self._lock:
+            version = data_version()
+            if self._loaded and version == self._version:
+                return
+            
+            changed = self._changes.poll()
+            if not self._loaded or changed is None:
+                self._load()
+            else:
+                with read_engine.connect() as connection:
+                    self._read_categories(connection)
+                    changed.update(connection.execute(
+                        select(Task.id).where(Task.id > self._max_id)
+                    ).scalars())
+                    self._refresh(connection, sorted(changed))
+            self._version = version
+    
+    def _load(self):
+        """Read every task and category."""
+        self._rows = {}
+        self._order = []
+        self._by_category = {}
+        self._by_priority = {}
+        with read_engine.connect() as connection:
+            self._read_categories(connection)
+            columns = [Task.__table__.c[name] for name in TASK_ROW_COLUMNS]
+            for values in connection.execute(select(*columns)):
+                row = TaskRow(values, self._categories)
+                self._rows[row.id] = row
+        
+        # Sorting once is much faster than inserting every key in order
+        keys = sorted(_row_key(row) for row in self._rows.values())
+        self._order = keys
+        for key in keys:
+            row = self._rows[key[-1]]
+            self._by_category.setdefault(row.category_id, []).append(key)
+            self._by_priority.setdefault(row.priority, []).append(key)
+        self._max_id = max(self._rows, default=0)
+        self._loaded = True
+        self.loads += 1
+    
+    def _read_categories(self, connection):
+        """Read the categories into the dict shared by every row."""
+        rows = connection.execute(select(Category.id, Category.name, Category.color))
+        categories = {row[0]: CategoryRow(*row) for row in rows}
+        # Update in place, rows hold a reference to the dict
+        self._categories.clear()
+        self._categories.update(categories)
+    
+    def _refresh(self, connection, task_ids):
+        """Read some tasks again, dropping the ones that no longer exist."""
+        columns = [Task.__table__.c[name] for name in TASK_ROW_COLUMNS]
+        for start in range(0, len(task_ids), _REFRESH_CHUNK):
+            chunk = task_ids[start:start + _REFRESH_CHUNK]
+            found = {
+                values[0]: TaskRow(values, self._categories)
+                for values in connection.execute(select(*columns).where(Task.id.in_(chunk)))
+            }
+            for task_id in chunk:
+                self._remove(task_id)
+                if task_id in found:
+                    self._add(found[task_id])
+        if self._max_id not in self._rows:
+            # SQLite reuses the ID of the last task once it is deleted
+            self._max_id = max(self._rows, default=0)
+    
+    def _add(self, row):
+        """Insert a row into the indexes."""
+        key = _row_key(row)
+        self._rows[row.id] = row
+        insort(self._order, key)
+        insort(self._by_category.setdefault(row.category_id, []), key)
+        insort(self._by_priority.setdefault(row.priority, []), key)
+        self._max_id = max(self._max_id, row.id)
+    
+    def _remove(self, task_id):
+        """Remove a row from the indexes, if present."""
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+        key = _row_key(row)
+        for keys in (self._order, self._by_category[row.category_id], self._by_priority[row.priority]):
+            del keys[bisect_left(keys, key)]
+    
+    def _keys(self, filters):
+        """
+        Find the range of order keys matching the filters.
+        
+        Returns:
+            A (keys, lo, hi) tuple, the matching keys are keys[lo:hi]
+        """
+        if filters.get("category_id"):
+            keys = self._by_category.get(filters["category_id"], [])
+        elif filters.get("priority"):
+            keys = self._by_priority.get(filters["priority"], [])
+        else:
+            keys = self._order
+        
+        lo, hi = 0, len(keys)
+        completed = filters.get("completed")
+        if completed is not None:
+            split = bisect_left(keys, (True,))
+            lo, hi = (split, hi) if completed else (lo, split)
+        return keys, lo, hi
+    
+    def _matches(self, row, filters):
+        """Check whether a row passes the filters."""
+        completed = filters.get("completed")
+        return (
+            (completed is None or row.completed == bool(completed))
+            and (not filters.get("category_id") or row.category_id == filters["category_id"])
+            and (not filters.get("priority") or row.priority == filters["priority"])
+        )
+    
+    def page(self, cursor=None, limit=TASK_PAGE_SIZE, backwards=False, **filters):
+        """
+        Get one page of the task list, like TaskController.get_tasks_page().
+        
+        Args:
+            cursor: Keyset cursor to continue from, None for the first page
+            limit: Maximum number of tasks in the page
+            backwards: Read the page sorting before the cursor instead of after it
+            **filters: Filters accepted by filter_tasks(), see supports()
+        
+        Returns:
+            A (tasks, next_cursor) tuple of TaskRow objects in list order
+        """
+        with self._lock:
+            self.sync()
+            keys, lo, hi = self._keys(filters)
+            if backwards:
+                end = bisect_left(keys, _cursor_key(cursor), lo, hi) if cursor else hi
+                selected = keys[max(lo, end - limit - 1):end]
+                more = len(selected) > limit
+                if more:
+                    selected = selected[1:]
+            else:
+                start = bisect_right(keys, _cursor_key(cursor), lo, hi) if cursor else lo
+                selected = keys[start:min(hi, start + limit + 1)]
+                more = len(selected) > limit
+                if more:
+                    selected = selected[:limit]
+            tasks = [self._rows[key[-1]] for key in selected]
+        
+        next_cursor = None
+        if more:
+            last = tasks[0] if backwards else tasks[-1]
+            due_date = last.due_date.isoformat() if last.due_date else None
+            next_cursor = [bool(last.completed), due_date, last.id]
+        return tasks, next_cursor
+    
+    def count_before(self, cursor, **filters):
+        """Count the matching tasks sorting before a keyset cursor."""
+        with self._lock:
+            self.sync()
+            keys, lo, hi = self._keys(filters)
+            return bisect_left(keys, _cursor_key(cursor), lo, hi) - lo
+    
+    def position(self, task_id, **filters):
+        """Get the index of a task in the filtered list, None if it is missing or filtered out."""
+        with self._lock:
+            self.sync()
+            row = self._rows.get(task_id)
+            if row is None or not self._matches(row, filters):
+                return None
+            keys, lo, hi = self._keys(filters)
+            return bisect_left(keys, _row_key(row), lo, hi) - lo
+    
+    def get(self, task_id):
+        """Get the TaskRow of a task, None if it does not exist."""
+        with self._lock:
+            self.sync()
+            return self._rows.get(task_id)
+    
+    def all_tasks(self):
+        """Get every task in list order."""
+        with self._lock:
+            self.sync()
+            return [self._rows[key[-1]] for key in self._order]
+    
+    def statistics(self):
+        """Get the task counts of TaskController.get_task_statistics(), without the overdue count."""
+        with self._lock:
+            self.sync()
+            total = len(self._order)
+            completed = total - bisect_left(self._order, (True,))
+            priorities = {1: 0, 2: 0, 3: 0}
+            for priority, keys in self._by_priority.items():
+                if keys:
+                    priorities[priority] = len(keys)
+        
+        return {
+            "total": total,
+            "completed": completed,
+            "priorities": priorities,
+            "pending": total - completed
+        }
+    
+    def _reset(self):
+        """Forget the lock inherited from a parent process after a fork."""
+        self._lock = threading.RLock()
+        self._changes.reset()
+
+
+# Store used by the controllers, None unless TASK_STORE is enabled on a SQLite file
+task_store = TaskStore() if TASK_STORE and _sqlite_file(engine.url) else None
+
+if task_store is not None and hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=task_store._reset)
@@ -0,0 +1,138 @@
+from concurrent.futures import Future
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from config import WRITE_BEHIND, WRITE_BATCH_SIZE, WRITE_BATCH_DELAY
+from database.db import db_session, session_factory
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of an operation to stop the writer thread
+_STOP = object()
+
+
+class WriteQueue(object):
+    """
+    Group commit of database mutations on a single writer thread.
+    
+    Operations are functions changing db_session without committing. The
+    writer runs queued operations in batches of up to batch_size, waiting
+    at most delay milliseconds for a batch to fill up, and commits each
+    batch once. Callers wait for durability on the Future of an operation,
+    which resolves after the commit of its batch.
+    """
+    
+    def __init__(self, batch_size=WRITE_BATCH_SIZE, delay=WRITE_BATCH_DELAY):
+        self.batch_size = batch_size
+        self.delay = delay / 1000.0
+        self.batches = 0
+        self.operations = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, operation):
+        """
+        Queue an operation for the writer thread.
+        
+        Args:
+            operation: Function changing db_session without committing
+        
+        Returns:
+            A Future resolving to the result of operation() once committed
+        """
+        self._start()
+        future = Future()
+        self._queue.put((operation, future))
+        return future
+    
+    def flush(self):
+        """Wait until every operation queued so far is committed."""
+        self.submit(lambda: None).result()
+    
+    def stop(self):
+        """Commit the queued operations and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put((_STOP, None))
+            thread.join()
+    
+    def _start(self):
+        """Start the writer thread, also after a fork, which does not copy threads."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+    
+    def _reset(self):
+        """Forget the operations and locks of a parent process after a fork."""
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def _run(self):
+        """Commit batches of queued operations until stopped."""
+        # Objects returned to callers keep their loaded values once committed
+        db_session.registry.set(session_factory(expire_on_commit=False))
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.delay
+                while len(batch) < self.batch_size and batch[-1][0] is not _STOP:
+                    # Past the deadline only take what is already queued
+                    timeout = deadline - time.monotonic()
+                    try:
+                        if timeout > 0:
+                            batch.append(self._queue.get(timeout=timeout))
+                        else:
+                            batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                stop = batch[-1][0] is _STOP
+                if stop:
+                    batch.pop()
+                if batch:
+                    self._commit(batch)
+                if stop:
+                    return
+        finally:
+            db_session.remove()
+    
+    def _commit(self, batch):
+        """Run a batch of operations and commit them together."""
+        try:
+            results = [operation() for operation, future in batch]
+            db_session.commit()
+        except Exception as error:
+            db_session.rollback()
+            if len(batch) == 1:
+                batch[0][1].set_exception(error)
+            else:
+                # Find the failing operation by committing the others one by one
+                logger.debug("Write batch failed, retrying %d operations singly", len(batch))
+                for item in batch:
+                    self._commit([item])
+            return
+        finally:
+            # Detach the committed objects so the session does not grow
+            db_session.close()
+        
+        self.batches += 1
+        self.operations += len(batch)
+        for (operation, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+# Queue used by the controllers, None unless WRITE_BEHIND is enabled
+write_queue = WriteQueue() if WRITE_BEHIND else None
+
+if write_queue is not None:
+    atexit.register(write_queue.stop)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=write_queue._reset)
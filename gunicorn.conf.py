@@ -0,0 +1,38 @@
+"""
+Gunicorn settings for serving the To-Do application on every core.
+
+Usage:
+    gunicorn wsgi:server
+"""
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get("BIND", "0.0.0.0:8050")
+
+# One worker process per core, each serving requests on several threads.
+# An open browser holds a thread for its /events stream, which waits without
+# using the CPU; PUSH_MAX_STREAMS caps the streams so threads stay free for
+# the callbacks, keep it below the number of threads.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 32))
+
+# Import the app, and initialize the database, once in the master before
+# forking the workers. The workers share the loaded code and drop the
+# inherited database connections after the fork.
+preload_app = True
+
+
+# Every worker writes its metrics to this directory and /metrics serves their
+# sum, whichever worker answers the scrape. Set before the app is imported.
+metrics_dir = os.environ.setdefault(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), f"todo-metrics-{bind.rsplit(':', 1)[-1]}")
+)
+
+
+def on_starting(server):
+    """Drop the metrics written by the workers of a previous run."""
+    if os.path.isdir(metrics_dir):
+        for name in os.listdir(metrics_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(metrics_dir, name))
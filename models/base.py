@@ -24,12 +24,18 @@ class BaseModel(object):
         """Get all records."""
         return cls.query.all()
     
-    def save(self, session):
-        """Save the record to the database."""
+    def save(self, session, commit=True):
+        """Save the record to the database, only flushing it if commit is False."""
         session.add(self)
-        session.commit()
+        if commit:
+            session.commit()
+        else:
+            session.flush()
     
-    def delete(self, session):
-        """Delete the record from the database."""
+    def delete(self, session, commit=True):
+        """Delete the record from the database, only flushing it if commit is False."""
         session.delete(self)
-        session.commit()
+        if commit:
+            session.commit()
+        else:
+            session.flush()
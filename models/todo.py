@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from collections import namedtuple
 from datetime import datetime
 
 from database.db import Base
@@ -20,10 +21,41 @@ class Category(Base, BaseModel):
         return f"<Category {self.name}>"
 
 
-class Task(Base, BaseModel):
+# Plain copy of a category row, safe to share between sessions and threads
+CategoryRow = namedtuple("CategoryRow", ["id", "name", "color"])
+
+
+class TaskStatus(object):
+    """Derived attributes of a task, shared by Task and the rows of the task store."""
+    
+    __slots__ = ()
+    
+    @property
+    def is_overdue(self):
+        """Check if task is overdue."""
+        if self.due_date and not self.completed:
+            return datetime.now() > self.due_date
+        return False
+    
+    @property
+    def priority_label(self):
+        """Return a text representation of priority."""
+        priority_map = {1: "Low", 2: "Medium", 3: "High"}
+        return priority_map.get(self.priority, "Medium")
+
+
+class Task(Base, BaseModel, TaskStatus):
     """Task model for to-do items."""
     
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Task list order: (completed, due_date), the id comes from the rowid
+        Index('ix_tasks_completed_due_date', 'completed', 'due_date'),
+        # Task list filtered by category
+        Index('ix_tasks_category_completed_due_date', 'category_id', 'completed', 'due_date'),
+        # Task list filtered by priority, also covers the statistics query
+        Index('ix_tasks_priority_completed_due_date', 'priority', 'completed', 'due_date'),
+    )
     
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
@@ -37,16 +69,3 @@ class Task(Base, BaseModel):
     
     def __repr__(self):
         return f"<Task {self.title}>"
-    
-    @property
-    def is_overdue(self):
-        """Check if task is overdue."""
-        if self.due_date and not self.completed:
-            return datetime.now() > self.due_date
-        return False
-    
-    @property
-    def priority_label(self):
-        """Return a text representation of priority."""
-        priority_map = {1: "Low", 2: "Medium", 3: "High"}
-        return priority_map.get(self.priority, "Medium")
@@ -0,0 +1,3 @@
+from monitoring.metrics import instrument_app, render_metrics
+
+__all__ = ['instrument_app', 'render_metrics']
@@ -0,0 +1,275 @@
+from bisect import bisect_left
+from functools import wraps
+import json
+import os
+import threading
+import time
+
+from dash.exceptions import PreventUpdate
+from flask import Response, g, has_request_context
+from config import METRICS_DIR, METRICS_WRITE_INTERVAL
+from database.db import add_statement_listener
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Label of work done outside of a callback
+NO_CALLBACK = "none"
+
+# Callback running on the current thread and the SQL it issued so far
+_current = threading.local()
+
+
+class Counter(object):
+    """Monotonic counter with one value per callback."""
+    
+    kind = "counter"
+    
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, callback, amount=1):
+        """Add amount to the counter of a callback."""
+        with self._lock:
+            self._values[callback] = self._values.get(callback, 0) + amount
+    
+    def samples(self):
+        """Return (name suffix, labels, value) tuples in exposition order."""
+        with self._lock:
+            return [("", {"callback": callback}, value) for callback, value in sorted(self._values.items())]
+
+
+class Histogram(object):
+    """Cumulative histogram with one set of buckets per callback."""
+    
+    kind = "histogram"
+    
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # callback: [count per bucket and one for +Inf, sum]
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, callback, value):
+        """Record one observation of a callback."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(callback)
+            if counts is None:
+                counts = self._values[callback] = [[0] * (len(self.buckets) + 1), 0]
+            counts[0][index] += 1
+            counts[1] += value
+    
+    def samples(self):
+        """Return (name suffix, labels, value) tuples in exposition order."""
+        with self._lock:
+            values = [(callback, list(counts[0]), counts[1]) for callback, counts in sorted(self._values.items())]
+        
+        samples = []
+        for callback, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                samples.append(("_bucket", {"callback": callback, "le": str(bound)}, cumulative))
+            samples.append(("_sum", {"callback": callback}, total))
+            samples.append(("_count", {"callback": callback}, cumulative))
+        return samples
+
+
+callback_duration = Histogram(
+    "dash_callback_duration_seconds", "Time spent in the callback function", LATENCY_BUCKETS
+)
+callback_errors = Counter("dash_callback_errors_total", "Callbacks that raised an exception")
+callback_response_bytes = Histogram(
+    "dash_callback_response_bytes", "Size of the callback response body", BYTES_BUCKETS
+)
+callback_statements = Histogram(
+    "dash_callback_statements", "SQL statements issued per callback call", STATEMENT_BUCKETS
+)
+sql_statements = Counter("db_statements_total", "SQL statements executed")
+sql_seconds = Counter("db_statement_seconds_total", "Time spent executing SQL statements")
+
+METRICS = [
+    callback_duration, callback_errors, callback_response_bytes, callback_statements,
+    sql_statements, sql_seconds
+]
+
+
+class SharedMetrics(object):
+    """
+    Metrics of every worker process, shared through files in a directory.
+    
+    Each process writes the samples of its metrics to <pid>.json every
+    interval seconds, and /metrics sums the files of all processes, so a
+    scrape reaching any worker sees the totals of the server. Files of
+    exited workers are kept, which keeps the summed counters monotonic.
+    """
+    
+    def __init__(self, directory, interval):
+        self.directory = directory
+        self.interval = interval
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Start writing the metrics of this process, once per process."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        os.makedirs(self.directory, exist_ok=True)
+        threading.Thread(target=self._run, name="metrics-writer", daemon=True).start()
+    
+    def _run(self):
+        """Write the metrics of this process every interval seconds."""
+        while True:
+            time.sleep(self.interval)
+            self.write()
+    
+    def write(self):
+        """Write the samples of this process, replacing its previous file."""
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w") as stream:
+            json.dump({metric.name: metric.samples() for metric in METRICS}, stream)
+        # Readers see either the previous or the new file, never a partial one
+        os.replace(path + ".tmp", path)
+    
+    def samples(self):
+        """
+        Sum the samples of every process.
+        
+        Returns:
+            A dict of metric name to (name suffix, labels, value) tuples
+        """
+        self.start()
+        self.write()
+        totals = {metric.name: {} for metric in METRICS}
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as stream:
+                    snapshot = json.load(stream)
+            except (OSError, ValueError):
+                continue
+            for metric_name, samples in snapshot.items():
+                merged = totals.get(metric_name)
+                if merged is None:
+                    continue
+                for suffix, labels, value in samples:
+                    key = (suffix, tuple(labels.items()))
+                    merged[key] = merged.get(key, 0) + value
+        return {
+            name: [(suffix, dict(labels), value) for (suffix, labels), value in merged.items()]
+            for name, merged in totals.items()
+        }
+
+
+# Shared metrics of the worker processes, None to serve the metrics of this process
+shared_metrics = SharedMetrics(METRICS_DIR, METRICS_WRITE_INTERVAL) if METRICS_DIR else None
+
+
+def _record_statement(cursor, statement, parameters, executemany, elapsed):
+    """Count a finished statement against the callback running on this thread."""
+    callback = getattr(_current, "callback", None)
+    if callback is not None:
+        _current.statements += 1
+    sql_statements.inc(callback or NO_CALLBACK)
+    sql_seconds.inc(callback or NO_CALLBACK, elapsed)
+
+
+def timed_callback(func):
+    """Wrap a callback function to record its latency, errors and SQL statements."""
+    name = func.__name__
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        _current.callback = name
+        _current.statements = 0
+        if has_request_context():
+            # Read back when the response size is known
+            g.dash_callback = name
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except PreventUpdate:
+            raise
+        except Exception:
+            callback_errors.inc(name)
+            raise
+        finally:
+            callback_duration.observe(name, time.perf_counter() - started)
+            callback_statements.observe(name, _current.statements)
+            _current.callback = None
+    
+    return wrapper
+
+
+def instrument_app(app):
+    """
+    Record metrics for every callback of a Dash app and serve them on /metrics.
+    
+    SQL statements are timed by the statement listeners of database/db.py.
+    Must be called before the callbacks are registered. Callback functions
+    stay callable directly, only the copy registered with Dash is wrapped.
+    
+    Args:
+        app: Dash app
+    """
+    register = app.callback
+    
+    @wraps(register)
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+        
+        def wrap(func):
+            decorator(timed_callback(func))
+            return func
+        
+        return wrap
+    
+    app.callback = callback
+    
+    # The engines are shared by every app of the process, count statements once
+    add_statement_listener(_record_statement)
+    
+    @app.server.after_request
+    def record_response_size(response):
+        name = g.get("dash_callback")
+        if name is not None:
+            callback_response_bytes.observe(name, response.content_length or 0)
+            if shared_metrics is not None:
+                # Workers are forked after the app is created, start writing in each
+                shared_metrics.start()
+        return response
+    
+    @app.server.route("/metrics")
+    def metrics():
+        """Serve the metrics in the Prometheus text format."""
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+def render_metrics():
+    """
+    Return every metric in the Prometheus text exposition format.
+    
+    The values are summed over the worker processes when METRICS_DIR is set,
+    otherwise they are the values of this process.
+    """
+    shared = shared_metrics.samples() if shared_metrics is not None else None
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        samples = shared[metric.name] if shared is not None else metric.samples()
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+            lines.append(f"{metric.name}{suffix}{{{label_text}}} {value}")
+    return "\n".join(lines) + "\n"
@@ -1,3 +1,3 @@
-from views.layout import create_layout
+from views.layout import create_layout, category_items
 
-__all__ = ['create_layout']
+__all__ = ['create_layout', 'category_items']
@@ -1,4 +1,16 @@
 from views.components.task_form import task_form
-from views.components.task_list import task_list, task_list_item
+from views.components.task_list import (
+    task_list, task_list_item, task_list_items, task_item_cache, bulk_action_options,
+    CLIENT_RENDERING, TASK_LIST_OUTPUT
+)
+from views.components.task_window import (
+    first_window, search_window, next_window_page, previous_window_page, patch_window_task,
+    window_size
+)
 
-__all__ = ['task_form', 'task_list', 'task_list_item']
+__all__ = [
+    'task_form', 'task_list', 'task_list_item', 'task_list_items', 'task_item_cache',
+    'bulk_action_options', 'CLIENT_RENDERING', 'TASK_LIST_OUTPUT',
+    'first_window', 'search_window', 'next_window_page', 'previous_window_page',
+    'patch_window_task', 'window_size'
+]
@@ -1,13 +1,116 @@
 import dash_bootstrap_components as dbc
-from dash import html, dcc
+from dash import html, dcc, Patch
+from collections import OrderedDict
 import datetime
+import threading
+import time
 
-from controllers.todo_controller import TaskController
+from config import TASK_ITEM_CACHE_SIZE, TASK_LIST_RENDERING
+from controllers.todo_controller import TaskController, CategoryController
 
 
-def task_list_item(task):
+class TaskItemCache(object):
     """
-    Create a list item for a single task.
+    Least recently used cache of rendered task list items.
+    
+    Items are stored per task ID together with the key they were rendered
+    for, so a changed task replaces its stale item instead of adding one.
+    """
+    
+    def __init__(self, maxsize=TASK_ITEM_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, task_id, key, render):
+        """
+        Return the cached item of a task, rendering it on a miss.
+        
+        Args:
+            task_id: ID of the task
+            key: Everything the rendered item depends on
+            render: Function rendering the item
+        
+        Returns:
+            A Dash list item component
+        """
+        with self._lock:
+            entry = self._items.get(task_id)
+            if entry is not None and entry[0] == key:
+                self._items.move_to_end(task_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        item = render()
+        with self._lock:
+            self._items[task_id] = (key, item)
+            self._items.move_to_end(task_id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return item
+    
+    def invalidate(self, task_id=None):
+        """Drop the item of a task, or every item if task_id is None."""
+        with self._lock:
+            if task_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(task_id, None)
+    
+    def info(self):
+        """Return the hit and miss counters and the size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._items),
+                "maxsize": self.maxsize
+            }
+
+
+task_item_cache = TaskItemCache()
+TaskController.add_change_listener(task_item_cache.invalidate)
+
+# In client rendering mode callbacks send compact task rows to the
+# task-list-data store and assets/task_rows.js renders the list items
+CLIENT_RENDERING = TASK_LIST_RENDERING == "client"
+
+# Output holding the rendered task list
+TASK_LIST_OUTPUT = ("task-list-data", "data") if CLIENT_RENDERING else ("task-list", "children")
+
+# Values of a task row, in order
+TASK_ROW_COLUMNS = [
+    "id", "title", "description", "due_date", "priority", "completed", "category_id", "overdue"
+]
+
+
+def task_list_item(task, category_version=None):
+    """
+    Create a list item for a single task, reusing the cached item when the
+    task has not changed since it was last rendered.
+    
+    Args:
+        task: Task object
+        category_version: CategoryController.get_version(), read once by
+            callers rendering many items, read now when None
+    
+    Returns:
+        A Dash list item component
+    """
+    if category_version is None:
+        category_version = CategoryController.get_version()
+    # updated_at only has a resolution of one second, mutations through
+    # TaskController, in this process or another, also invalidate the item
+    key = (task.updated_at, category_version, task.is_overdue)
+    return task_item_cache.get(task.id, key, lambda: render_task_list_item(task))
+
+
+def render_task_list_item(task):
+    """
+    Render the list item of a single task.
     
     Args:
         task: Task object
@@ -54,6 +157,13 @@ def task_list_item(task):
     
     return dbc.ListGroupItem(
         [
+            # Checkbox selecting the task for bulk actions
+            dbc.Checkbox(
+                id={"type": "task-select", "index": task.id},
+                value=False,
+                className="float-start me-2 task-select"
+            ),
+            
             # Checkbox for task completion
             dbc.Checkbox(
                 id={"type": "task-checkbox", "index": task.id},
@@ -110,38 +220,224 @@ def task_list_item(task):
     )
 
 
-def task_list(tasks=None, filter_completed=False, category_id=None):
+def task_list_items(tasks):
     """
-    Create a list of tasks with filtering options.
+    Create the list items for a page of tasks.
     
     Args:
-        tasks: List of Task objects, if None, fetches all tasks
-        filter_completed: Whether to filter out completed tasks
-        category_id: Category ID to filter by
+        tasks: List of Task objects
     
     Returns:
-        A Dash list component
+        A list of Dash list item components
     """
-    if tasks is None:
-        tasks = TaskController.get_all_tasks()
+    category_version = CategoryController.get_version()
+    list_items = [task_list_item(task, category_version) for task in tasks]
     
-    # Apply filters
-    if filter_completed:
-        tasks = [task for task in tasks if not task.completed]
+    if not list_items:
+        list_items = [
+            dbc.ListGroupItem(
+                "No tasks found. Add a new task to get started!",
+                className="text-center font-italic"
+            )
+        ]
     
-    if category_id:
-        tasks = [task for task in tasks if task.category_id == category_id]
+    return list_items
+
+
+def search_result_items(tasks, has_more):
+    """
+    Create the list items of the best matches of a search.
+    
+    Args:
+        tasks: List of matching Task objects, best match first
+        has_more: Whether more tasks match than are listed
     
-    # Create list items
-    list_items = [task_list_item(task) for task in tasks]
+    Returns:
+        A list of Dash list item components
+    """
+    category_version = CategoryController.get_version()
+    list_items = [task_list_item(task, category_version) for task in tasks]
     
     if not list_items:
         list_items = [
             dbc.ListGroupItem(
-                "No tasks found. Add a new task to get started!",
+                "No tasks match the search.",
                 className="text-center font-italic"
             )
         ]
+    elif has_more:
+        list_items.append(
+            dbc.ListGroupItem(
+                f"Showing the {len(tasks)} best matches, refine the search to find other tasks.",
+                className="text-center text-muted small"
+            )
+        )
+    
+    return list_items
+
+
+def task_row(task):
+    """Return the values of a task in the order of TASK_ROW_COLUMNS."""
+    return [
+        task.id,
+        task.title,
+        task.description,
+        task.due_date.strftime("%Y-%m-%d") if task.due_date else None,
+        task.priority,
+        task.completed,
+        task.category_id,
+        task.is_overdue
+    ]
+
+
+def task_list_data(tasks, search=False, has_more=False):
+    """
+    Create the task-list-data store contents for client rendering.
+    
+    Args:
+        tasks: List of Task objects
+        search: Whether the tasks are search results
+        has_more: Whether more tasks match the search than are listed
+    
+    Returns:
+        A dict with the column names, one row per task, the name and color of
+        each category by ID and the search flags
+    """
+    return {
+        "columns": TASK_ROW_COLUMNS,
+        "rows": [task_row(task) for task in tasks],
+        "categories": category_lookup(),
+        "search": search,
+        "has_more": has_more,
+        # Tells the browser a full render replaced the list, patches keep it
+        "rendered_at": time.time()
+    }
+
+
+def category_lookup():
+    """Return the [name, color] of every category by ID."""
+    return {cat.id: [cat.name, cat.color] for cat in CategoryController.get_all_categories()}
+
+
+def task_list_content(tasks):
+    """Render a page of tasks into the TASK_LIST_OUTPUT of the current rendering mode."""
+    return task_list_data(tasks) if CLIENT_RENDERING else task_list_items(tasks)
+
+
+def search_result_content(tasks, has_more):
+    """Render search results into the TASK_LIST_OUTPUT of the current rendering mode."""
+    if CLIENT_RENDERING:
+        return task_list_data(tasks, search=True, has_more=has_more)
+    return search_result_items(tasks, has_more)
+
+
+def task_list_entry(task):
+    """Render one task as an entry of the list patched by task_list_patch()."""
+    return task_row(task) if CLIENT_RENDERING else task_list_item(task)
+
+
+def task_list_entries(tasks):
+    """Render a page of tasks as entries of the list patched by task_list_patch()."""
+    if CLIENT_RENDERING:
+        return [task_row(task) for task in tasks]
+    category_version = CategoryController.get_version()
+    return [task_list_item(task, category_version) for task in tasks]
+
+
+def task_list_patch():
+    """
+    Create a Patch of the list of rendered tasks.
+    
+    In client rendering mode the Patch targets the rows of the store and also
+    refreshes the category lookup, which patched rows may refer to.
+    """
+    if not CLIENT_RENDERING:
+        return Patch()
+    data = Patch()
+    data["categories"] = category_lookup()
+    return data["rows"]
+
+
+def window_page(tasks):
+    """Return the [first_cursor, last_cursor, count] window entry of a page of tasks."""
+    return [
+        TaskController.get_task_cursor(tasks[0]),
+        TaskController.get_task_cursor(tasks[-1]),
+        len(tasks)
+    ]
+
+
+def page_window(tasks, next_cursor):
+    """
+    Describe a task list window holding a single page of tasks.
+    
+    Args:
+        tasks: List of Task objects
+        next_cursor: Cursor of the page following tasks, if any
+    
+    Returns:
+        Window data for the task-list-window store (see task_window.py)
+    """
+    return {
+        "pages": [window_page(tasks)] if tasks else [],
+        "offset": 0,
+        "has_next": next_cursor is not None
+    }
+
+
+def bulk_action_options(categories):
+    """
+    Create the options of the bulk action dropdown.
+    
+    Args:
+        categories: List of categories tasks can be moved to
+    
+    Returns:
+        A list of dropdown options
+    """
+    options = [
+        {"label": "Mark as completed", "value": "complete"},
+        {"label": "Mark as pending", "value": "reopen"},
+        {"label": "Delete", "value": "delete"},
+        {"label": "Set priority: High", "value": "priority:3"},
+        {"label": "Set priority: Medium", "value": "priority:2"},
+        {"label": "Set priority: Low", "value": "priority:1"},
+        {"label": "Move to: No Category", "value": "category:"}
+    ]
+    options.extend(
+        {"label": f"Move to: {cat.name}", "value": f"category:{cat.id}"}
+        for cat in categories
+    )
+    return options
+
+
+def task_list(tasks=None, filter_completed=False, next_cursor=None, categories=None):
+    """
+    Create a list of tasks with filtering options.
+    
+    Args:
+        tasks: List of Task objects, if None, the list is left empty for the
+            update_task_list callback to fill when the page loads
+        filter_completed: Whether to filter out completed tasks
+        next_cursor: Cursor of the page following tasks, if any
+        categories: Categories offered by the bulk actions, if None, fetches them
+    
+    Returns:
+        A Dash list component
+    """
+    if categories is None:
+        categories = CategoryController.get_all_categories()
+    
+    # The list items are rendered in the browser in client rendering mode
+    if tasks is None:
+        list_items = []
+        list_data = dcc.Store(id="task-list-data") if CLIENT_RENDERING else None
+    elif CLIENT_RENDERING:
+        list_items = []
+        list_data = dcc.Store(id="task-list-data", data=task_list_data(tasks))
+    else:
+        list_items = task_list_items(tasks)
+        list_data = None
     
     return html.Div(
         [
@@ -179,7 +475,83 @@ def task_list(tasks=None, filter_completed=False, category_id=None):
                 className="mb-3"
             ),
             
-            # Task list
-            dbc.ListGroup(list_items, id="task-list")
+            # Search, results are sent once typing paused for 300 ms
+            dcc.Input(
+                id="task-search",
+                type="search",
+                placeholder="Search tasks...",
+                debounce=0.3,
+                className="form-control mb-3"
+            ),
+            
+            # Bulk actions on the selected tasks, or on every task matching the filters
+            dbc.Row(
+                [
+                    dbc.Col(
+                        dbc.Select(
+                            id="bulk-action",
+                            options=bulk_action_options(categories),
+                            placeholder="Bulk action..."
+                        ),
+                        width=5
+                    ),
+                    dbc.Col(
+                        dbc.Checkbox(
+                            id="select-all-tasks",
+                            label="All matching tasks",
+                            value=False
+                        ),
+                        width=4,
+                        className="d-flex align-items-center"
+                    ),
+                    dbc.Col(
+                        dbc.Button(
+                            "Apply",
+                            id="apply-bulk-action",
+                            color="secondary",
+                            className="float-end"
+                        ),
+                        width=3,
+                        className="text-end"
+                    )
+                ],
+                className="mb-3"
+            ),
+            
+            # Task list, only a window of pages is rendered and the
+            # buttons at both ends are clicked when scrolled into view
+            html.Div(
+                [
+                    html.Div(
+                        dbc.Button(
+                            "Load previous",
+                            id="load-previous-tasks",
+                            color="link",
+                            style={"display": "none"}
+                        ),
+                        className="text-center mb-2"
+                    ),
+                    dbc.ListGroup(list_items, id="task-list"),
+                    html.Div(
+                        dbc.Button(
+                            "Load more",
+                            id="load-more-tasks",
+                            color="link",
+                            style={"display": "none"}
+                        ),
+                        className="text-center mt-2"
+                    )
+                ],
+                id="task-list-viewport",
+                className="task-list-viewport"
+            ),
+            dcc.Store(id="task-list-window", data=page_window(tasks or [], next_cursor)),
+            list_data,
+            
+            # Events of the clicked task items and of the bulk action button
+            dcc.Store(id="task-toggle-event"),
+            dcc.Store(id="task-edit-event"),
+            dcc.Store(id="task-delete-event"),
+            dcc.Store(id="bulk-action-event")
         ]
     )
@@ -0,0 +1,197 @@
+from config import TASK_WINDOW_PAGES
+from controllers.todo_controller import TaskController
+from views.components.task_list import (
+    task_list_content, search_result_content, task_list_entry, task_list_entries, task_list_patch,
+    window_page, page_window
+)
+
+
+# The browser only holds a window of consecutive pages of the task list,
+# described by the data of the "task-list-window" store:
+#
+#   pages: [first_cursor, last_cursor, count] of each loaded page
+#   offset: number of tasks sorting before the window
+#   has_next: whether tasks sort after the window
+#
+# The cursors of a page bound its tasks even after some of them changed, so
+# fetching before the first page or after the last one never repeats a task.
+
+
+def window_size(window):
+    """Return the number of tasks rendered in a window."""
+    return sum(page[2] for page in window["pages"]) if window else 0
+
+
+def first_window(**filters):
+    """
+    Render the first page of the task list.
+    
+    Args:
+        **filters: Filters accepted by TaskController.filter_tasks()
+    
+    Returns:
+        A (task list, window) tuple
+    """
+    tasks, next_cursor = TaskController.get_tasks_page(**filters)
+    return task_list_content(tasks), page_window(tasks, next_cursor)
+
+
+def search_window(terms, **filters):
+    """
+    Render the best matches of a search in place of the task list.
+    
+    Search results are ranked rather than in list order, so they come with an
+    empty window that is neither scrolled nor patched.
+    
+    Args:
+        terms: Words to search for
+        **filters: Filters accepted by TaskController.filter_tasks()
+    
+    Returns:
+        A (task list, window) tuple
+    """
+    tasks, has_more = TaskController.search_tasks(terms, **filters)
+    return search_result_content(tasks, has_more), page_window([], None)
+
+
+def next_window_page(window, **filters):
+    """
+    Append the page following a window, dropping pages from its top.
+    
+    Args:
+        window: Current window data
+        **filters: Filters accepted by TaskController.filter_tasks()
+    
+    Returns:
+        A (task list Patch, window) tuple
+    """
+    tasks, next_cursor = TaskController.get_tasks_page(cursor=window["pages"][-1][1], **filters)
+    list_items = task_list_patch()
+    pages = list(window["pages"])
+    offset = window["offset"]
+    
+    if tasks:
+        list_items.extend(task_list_entries(tasks))
+        pages.append(window_page(tasks))
+    
+    while len(pages) > TASK_WINDOW_PAGES:
+        count = pages.pop(0)[2]
+        for _ in range(count):
+            del list_items[0]
+        offset += count
+    
+    return list_items, {"pages": pages, "offset": offset, "has_next": next_cursor is not None}
+
+
+def previous_window_page(window, **filters):
+    """
+    Prepend the page preceding a window, dropping pages from its bottom.
+    
+    Args:
+        window: Current window data
+        **filters: Filters accepted by TaskController.filter_tasks()
+    
+    Returns:
+        A (task list Patch, window) tuple
+    """
+    tasks, previous_cursor = TaskController.get_tasks_page(
+        cursor=window["pages"][0][0],
+        backwards=True,
+        **filters
+    )
+    list_items = task_list_patch()
+    pages = list(window["pages"])
+    has_next = window["has_next"]
+    
+    for index, entry in enumerate(task_list_entries(tasks)):
+        list_items.insert(index, entry)
+    if tasks:
+        pages.insert(0, window_page(tasks))
+    # Reaching the top of the list also resyncs the offset
+    offset = window["offset"] - len(tasks) if previous_cursor else 0
+    
+    size = sum(page[2] for page in pages)
+    while len(pages) > TASK_WINDOW_PAGES:
+        count = pages.pop()[2]
+        for _ in range(count):
+            size -= 1
+            del list_items[size]
+        has_next = has_next or count > 0
+    
+    return list_items, {"pages": pages, "offset": offset, "has_next": has_next}
+
+
+def patch_window_task(window, task_id, old_position, **filters):
+    """
+    Move one task of a window after it was created, changed or deleted.
+    
+    Args:
+        window: Current window data
+        task_id: ID of the task that changed
+        old_position: Index of the task in the full list before the change,
+            None if it was not listed
+        **filters: Filters accepted by TaskController.filter_tasks()
+    
+    Returns:
+        A (task list Patch, window) tuple, or None when the window emptied
+        and has to be rendered again
+    """
+    # Callers only patch windows holding at least one task
+    pages = [list(page) for page in window["pages"]]
+    offset = window["offset"]
+    
+    # Take the task out of its old place
+    old_index = None
+    if old_position is not None:
+        if old_position < offset:
+            offset -= 1
+        elif old_position - offset < window_size(window):
+            old_index = old_position - offset
+            start = 0
+            for page in pages:
+                if old_index < start + page[2]:
+                    page[2] -= 1
+                    break
+                start += page[2]
+    
+    # Put it where it now sorts, unless that is outside of the window
+    task = TaskController.get_task_by_id(task_id)
+    new_index = None
+    if task is not None:
+        cursor = TaskController.get_task_cursor(task)
+        position = TaskController.get_task_position(task_id, **filters)
+        if position is None:
+            pass
+        elif offset and TaskController.cursor_precedes(cursor, pages[0][0]):
+            offset += 1
+        elif not window["has_next"] or not TaskController.cursor_precedes(pages[-1][1], cursor):
+            new_index = position - offset
+            start = 0
+            for number, page in enumerate(pages):
+                end = start + page[2]
+                # A task between two pages joins the earlier one when it sorts
+                # before the first cursor of the later one
+                if new_index < end or (new_index == end and (
+                        number == len(pages) - 1
+                        or TaskController.cursor_precedes(cursor, pages[number + 1][0]))):
+                    if new_index == 0:
+                        page[0] = cursor
+                    if new_index == end:
+                        page[1] = cursor
+                    page[2] += 1
+                    break
+                start = end
+    
+    if not sum(page[2] for page in pages):
+        return None
+    
+    list_items = task_list_patch()
+    if old_index is not None and old_index == new_index:
+        list_items[new_index] = task_list_entry(task)
+    else:
+        if old_index is not None:
+            del list_items[old_index]
+        if new_index is not None:
+            list_items.insert(new_index, task_list_entry(task))
+    
+    return list_items, {"pages": pages, "offset": offset, "has_next": window["has_next"]}
@@ -1,35 +1,32 @@
 import dash_bootstrap_components as dbc
 from dash import html, dcc
+from functools import lru_cache
 
-from views.components import task_list, task_form
+from config import DASH_UPDATE_INTERVAL, PUSH_UPDATES
+from views.components import task_list
 from controllers.todo_controller import CategoryController
 
 
 def create_layout():
-    """Create the main application layout."""
+    """
+    Create the main application layout.
+    
+    Dash calls this on every page load, so the categories are current. The
+    tasks and statistics are filled by their callbacks once the page loaded,
+    and the parts that never change are built once and shared.
+    """
     categories = CategoryController.get_all_categories()
     
     return dbc.Container(
         [
-            # Header
-            html.Div(
-                [
-                    html.H1("To-Do App", className="display-4"),
-                    html.P(
-                        "A simple task management application",
-                        className="lead"
-                    ),
-                    html.Hr(className="my-4")
-                ],
-                className="jumbotron py-4 mb-4"
-            ),
+            layout_header(),
             
             # Main content
             dbc.Row(
                 [
                     # Task list
                     dbc.Col(
-                        task_list(),
+                        task_list(categories=categories),
                         md=8
                     ),
                     
@@ -46,114 +43,176 @@ def create_layout():
                             html.Div(
                                 [
                                     html.H4("Categories", className="mb-3"),
-                                    
-                                    # Add category form
-                                    dbc.Form(
-                                        dbc.Row(
-                                            [
-                                                dbc.Col(
-                                                    dbc.Input(
-                                                        id="category-name-input",
-                                                        type="text",
-                                                        placeholder="New category name"
-                                                    ),
-                                                    className="me-2"
-                                                ),
-                                                dbc.Col(
-                                                    dbc.Input(
-                                                        id="category-color-input",
-                                                        type="color",
-                                                        value="#007BFF",
-                                                        className="ms-2",
-                                                        style={"width": "50px"}
-                                                    ),
-                                                    width="auto"
-                                                ),
-                                                dbc.Col(
-                                                    dbc.Button(
-                                                        "Add",
-                                                        id="add-category-button",
-                                                        color="primary",
-                                                        className="ms-2"
-                                                    ),
-                                                    width="auto"
-                                                )
-                                            ],
-                                            className="d-flex align-items-center"
-                                        ),
-                                        className="mb-3"
-                                    ),
+                                    category_form(),
                                     
                                     # Category list
                                     dbc.ListGroup(
-                                        [
-                                            dbc.ListGroupItem(
-                                                [
-                                                    html.Span(
-                                                        cat.name,
-                                                        style={
-                                                            "backgroundColor": cat.color,
-                                                            "color": "white",
-                                                            "padding": "0.25rem 0.5rem",
-                                                            "borderRadius": "0.25rem"
-                                                        }
-                                                    ),
-                                                    html.Button(
-                                                        html.I(className="fas fa-trash"),
-                                                        id={"type": "delete-category", "index": cat.id},
-                                                        className="btn btn-sm btn-outline-danger float-end",
-                                                        title="Delete Category"
-                                                    )
-                                                ],
-                                                id={"type": "category-item", "index": cat.id},
-                                                action=True
-                                            )
-                                            for cat in categories
-                                        ] if categories else [
-                                            dbc.ListGroupItem(
-                                                "No categories yet. Add one above!",
-                                                className="text-center font-italic"
-                                            )
-                                        ],
+                                        category_items(categories),
                                         id="category-list"
                                     )
                                 ],
                                 className="mt-4"
                             ),
                             
-                            # Statistics section
-                            html.Div(
-                                [
-                                    html.H4("Statistics", className="mb-3"),
-                                    html.Div(id="task-statistics")
-                                ],
-                                className="mt-4"
-                            )
+                            statistics_section()
                         ],
                         md=4
                     )
                 ]
             ),
             
-            # Footer
-            html.Footer(
-                html.P(
-                    "To-Do App - A Full Stack Dash Application",
-                    className="text-center text-muted"
-                ),
-                className="mt-4 pt-3 border-top"
-            ),
-            
-            # Stores for app state
-            dcc.Store(id="app-state"),
-            
-            # Interval for refreshing data
-            dcc.Interval(
-                id="refresh-interval",
-                interval=30000,  # 30 seconds
-                n_intervals=0
-            )
+            *layout_footer()
         ],
         fluid=True,
         className="py-3"
     )
+
+
+@lru_cache(maxsize=None)
+def layout_header():
+    """Create the page header."""
+    return html.Div(
+        [
+            html.H1("To-Do App", className="display-4"),
+            html.P(
+                "A simple task management application",
+                className="lead"
+            ),
+            html.Hr(className="my-4")
+        ],
+        className="jumbotron py-4 mb-4"
+    )
+
+
+@lru_cache(maxsize=None)
+def category_form():
+    """Create the form adding a category."""
+    return dbc.Form(
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.Input(
+                        id="category-name-input",
+                        type="text",
+                        placeholder="New category name"
+                    ),
+                    className="me-2"
+                ),
+                dbc.Col(
+                    dbc.Input(
+                        id="category-color-input",
+                        type="color",
+                        value="#007BFF",
+                        className="ms-2",
+                        style={"width": "50px"}
+                    ),
+                    width="auto"
+                ),
+                dbc.Col(
+                    dbc.Button(
+                        "Add",
+                        id="add-category-button",
+                        color="primary",
+                        className="ms-2"
+                    ),
+                    width="auto"
+                )
+            ],
+            className="d-flex align-items-center"
+        ),
+        className="mb-3"
+    )
+
+
+def category_items(categories):
+    """
+    Create the items of the category list.
+    
+    Args:
+        categories: List of Category objects
+    
+    Returns:
+        A list of Dash list item components
+    """
+    if not categories:
+        return [
+            dbc.ListGroupItem(
+                "No categories yet. Add one above!",
+                className="text-center font-italic"
+            )
+        ]
+    
+    return [
+        dbc.ListGroupItem(
+            [
+                html.Span(
+                    cat.name,
+                    style={
+                        "backgroundColor": cat.color,
+                        "color": "white",
+                        "padding": "0.25rem 0.5rem",
+                        "borderRadius": "0.25rem"
+                    }
+                ),
+                html.Button(
+                    html.I(className="fas fa-trash"),
+                    id={"type": "delete-category", "index": cat.id},
+                    className="btn btn-sm btn-outline-danger float-end",
+                    title="Delete Category"
+                )
+            ],
+            id={"type": "category-item", "index": cat.id},
+            action=True
+        )
+        for cat in categories
+    ]
+
+
+@lru_cache(maxsize=None)
+def statistics_section():
+    """Create the statistics section, filled by the update_statistics callback."""
+    return html.Div(
+        [
+            html.H4("Statistics", className="mb-3"),
+            html.Div(id="task-statistics")
+        ],
+        className="mt-4"
+    )
+
+
+@lru_cache(maxsize=None)
+def layout_footer():
+    """Create the footer and the hidden components holding the app state."""
+    return (
+        html.Footer(
+            html.P(
+                "To-Do App - A Full Stack Dash Application",
+                className="text-center text-muted"
+            ),
+            className="mt-4 pt-3 border-top"
+        ),
+        
+        # Stores for app state, holds the data revision each panel was rendered at
+        dcc.Store(id="app-state", data={}),
+        
+        # Refresh data when assets/push.js reports a change on the event
+        # stream, and poll while the stream is down
+        html.Button(
+            id="push-refresh",
+            style={"display": "none"},
+            **{"data-url": "/events" if PUSH_UPDATES else ""}
+        ),
+        dcc.Interval(
+            id="refresh-interval",
+            interval=DASH_UPDATE_INTERVAL,
+            n_intervals=0
+        ),
+        # Refresh right after the next task becomes overdue while the stream
+        # is down, timed by the statistics callback
+        dcc.Interval(
+            id="overdue-timer",
+            disabled=True,
+            n_intervals=0
+        ),
+        dcc.Store(id="refresh-signal")
+    )
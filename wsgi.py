@@ -0,0 +1,18 @@
+"""
+WSGI entry point of the To-Do application.
+
+Serve it with gunicorn, using the settings of gunicorn.conf.py:
+    gunicorn wsgi:server
+
+Importing this module initializes the database once. With preload_app the
+gunicorn master imports it before forking the workers, which then drop the
+inherited database connections (see database/db.py) and open their own,
+without checking the schema again.
+"""
+from app import app
+from database.db import ensure_db
+
+ensure_db()
+
+# Flask application served by the workers
+server = app.server